@@ -0,0 +1,65 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
+from typing import Iterable
+
+
+class AffixIndex():
+    """Sorted forward and reversed copies of a word table.
+
+    All words starting with a prefix are one contiguous range of the forward
+    list, and all words ending with a suffix are one contiguous range of the
+    reversed list, so both are found with a pair of bisects.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.forward: list[str] = sorted(words)
+        self.backward: list[str] = sorted(word[::-1] for word in self.forward)
+
+    def add(self, words: Iterable[str]) -> None:
+        for word in words:
+            insort(self.forward, word)
+            insort(self.backward, word[::-1])
+
+    @staticmethod
+    def _range(words: list[str], prefix: str) -> tuple[int, int]:
+        m = len(prefix)
+
+        def key(word: str) -> str:
+            return word[:m]
+
+        lo = bisect_left(words, prefix, key=key)
+        hi = bisect_right(words, prefix, lo=lo, key=key)
+        return lo, hi
+
+    def prefixed(self, prefix: str) -> list[str]:
+        """Return every word starting with prefix."""
+        lo, hi = self._range(self.forward, prefix)
+        return self.forward[lo:hi]
+
+    def suffixed(self, suffix: str) -> list[str]:
+        """Return every word ending with suffix."""
+        lo, hi = self._range(self.backward, suffix[::-1])
+        return [word[::-1] for word in self.backward[lo:hi]]
+
+    def count_prefixed(self, prefix: str) -> int:
+        lo, hi = self._range(self.forward, prefix)
+        return hi - lo
+
+    def count_suffixed(self, suffix: str) -> int:
+        lo, hi = self._range(self.backward, suffix[::-1])
+        return hi - lo
+
+    def sandwiched(self, prefix: str, suffix: str) -> list[str]:
+        """Return every word of the form prefix, one or more letters, then
+        suffix (i.e. the regex prefix.+suffix)."""
+        min_length = len(prefix) + len(suffix) + 1
+
+        # Walk whichever side has fewer words, and check the other end
+        # directly.
+        if self.count_prefixed(prefix) <= self.count_suffixed(suffix):
+            return [word for word in self.prefixed(prefix)
+                    if len(word) >= min_length and word.endswith(suffix)]
+
+        return [word for word in self.suffixed(suffix)
+                if len(word) >= min_length and word.startswith(prefix)]
@@ -0,0 +1,93 @@
+import itertools
+
+from collections import Counter
+from collections import defaultdict
+from typing import Iterable
+
+
+class AnagramIndex():
+    """Words grouped by their sorted-letter signature.
+
+    Anagram questions become hash probes: exact anagrams are one probe,
+    plus/minus one letter is one probe per letter, and sub-anagrams of a
+    letter bank are one probe per sub-multiset of the bank.
+    """
+
+    # Past this many sub-multisets, probing would cost more than checking
+    # every signature.
+    MAX_BANK_PROBES = 1 << 16
+
+    def __init__(self, words: Iterable[str]) -> None:
+        # self.signatures is a dict { signature: [word] }
+        self.signatures: dict[str, list[str]] = defaultdict(list)
+
+        # Letters that appear anywhere, i.e. the only ones worth adding
+        self.alphabet: str = ''
+
+        self.add(words)
+
+    def add(self, words: Iterable[str]) -> None:
+        letters = set(self.alphabet)
+        for word in words:
+            self.signatures[self.signature(word)].append(word)
+            letters.update(word)
+
+        self.alphabet = ''.join(sorted(letters))
+
+    @staticmethod
+    def signature(letters: str) -> str:
+        return ''.join(sorted(letters))
+
+    def anagrams(self, letters: str) -> list[str]:
+        return list(self.signatures.get(self.signature(letters), []))
+
+    def plus_one(self, letters: str) -> dict[str, list[str]]:
+        """Return { added letter: [anagrams] }."""
+        results = {}
+        for letter in self.alphabet:
+            words = self.signatures.get(self.signature(letters + letter))
+            if words:
+                results[letter] = list(words)
+
+        return results
+
+    def minus_one(self, letters: str) -> dict[str, list[str]]:
+        """Return { dropped letter: [anagrams] }."""
+        results = {}
+        for letter in sorted(set(letters)):
+            words = self.signatures.get(self.signature(
+                letters.replace(letter, '', 1)))
+            if words:
+                results[letter] = list(words)
+
+        return results
+
+    def sub_anagrams(self, bank: str, min_length: int = 3) -> list[str]:
+        """Return every word that can be spelled from the letter bank (each
+        letter used at most as many times as it's in the bank)."""
+        counts = Counter(bank)
+
+        probes = 1
+        for count in counts.values():
+            probes *= count + 1
+
+        results = []
+
+        if probes > self.MAX_BANK_PROBES:
+            for signature, words in self.signatures.items():
+                if len(signature) >= min_length and \
+                        not Counter(signature) - counts:
+                    results.extend(words)
+            return results
+
+        # Every sub-multiset, as a count (0..n) for each distinct letter
+        letters = sorted(counts)
+        for picks in itertools.product(*[range(counts[c] + 1)
+                                         for c in letters]):
+            if sum(picks) < min_length:
+                continue
+
+            signature = ''.join(c * n for c, n in zip(letters, picks))
+            results.extend(self.signatures.get(signature, []))
+
+        return results
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+# Run many queries without the REPL, printing results as JSON lines.
+#
+# Queries use the REPL syntax, one per line:
+#
+#   word                bare word: exact match and substring search
+#   r pattern 8-15 50+  regex search (a bare word with a . is one too)
+#   s word              sandwich search
+#   a letters 50+       anagrams
+#   b letters 50+       letter bank
+#   n word 2 50+        edit-distance neighbors
+#
+# Blank lines and lines starting with # are skipped. Each query prints one
+# JSON object with the query and its results (or an error), in input order.
+#
+#   ./batch.py ~/wordlists -j 8 -q themes.txt > results.jsonl
+
+import argparse
+import gc
+import json
+import multiprocessing
+import sys
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+import util
+from main import Shell
+from stats import recorder
+from stats import Recorder
+from wordlist import Wordlist
+
+# The loaded wordlist. Set before the pool forks, so every worker shares the
+# parent's copy (and its indexes) instead of loading its own.
+_wordlist: Wordlist | None = None
+
+# Whether to add each query's stage timings to its output.
+_with_stats = False
+
+# Time limit per query, in seconds
+_budget: float | None = None
+
+# REPL defaults
+SCORE_MIN = 40
+LEN_MIN = 8
+LEN_MAX = 15
+
+
+# QUERIES #
+###########
+def parse_options(words: list[str], score_min: int = SCORE_MIN
+                  ) -> tuple[list[str], int, int | None, int | None]:
+    """Split N+ and N-M options from the rest of a query's arguments.
+
+    Returns (arguments, score minimum, length minimum, length maximum)."""
+    args = []
+    len_min: int | None = None
+    len_max: int | None = None
+
+    for word in words:
+        if Shell.score_regex.fullmatch(word):
+            score_min = int(word[:-1])
+        elif Shell.len_regex.fullmatch(word):
+            len_min, len_max = [int(x) for x in word.split('-')]
+        else:
+            args.append(word)
+
+    return args, score_min, len_min, len_max
+
+def scored(matches: Iterable[tuple[str, int]]) -> list[list[Any]]:
+    # Same order the REPL prints them in
+    return [[k, v] for k, v in sorted(matches,
+                                      key=lambda t: (len(t[0]), t[0]))]
+
+def run_query(wl: Wordlist, line: str) -> dict[str, Any]:
+    words = line.split()
+    command = words[0]
+
+    if command == 'r' or '.' in command:
+        args, score_min, len_min, len_max = parse_options(
+            words[1:] if command == 'r' else words)
+        if len(args) == 0:
+            raise ValueError('expected a pattern')
+
+        matches, complete = wl.collect(
+            wl.iter_search_regex(args[0], score_min,
+                                 len_min=len_min or LEN_MIN,
+                                 len_max=len_max or LEN_MAX))
+        recorder.count('search', len(matches), wl.last_scan[0])
+        return partial({'results': scored(matches)}, complete)
+
+    if command == 's':
+        args, score_min, _, _ = parse_options(words[1:])
+        if len(args) == 0 or len(args[0]) < 2:
+            raise ValueError('need at least two characters')
+
+        word = util.normalize(' '.join(args))
+        groups, complete = wl.collect(wl.iter_search_sandwich(word,
+                                                              score_min))
+        return partial({'results': [{'prefix': prefix, 'suffix': suffix,
+                                     'words': scored(matches.items())}
+                                    for prefix, suffix, matches in groups]},
+                       complete)
+
+    if command == 'a':
+        args, score_min, _, _ = parse_options(words[1:])
+        letters = util.normalize(''.join(args))
+        return {'results': {label: scored(matches.items())
+                            for label, matches
+                            in wl.search_anagram(letters, score_min)}}
+
+    if command == 'b':
+        args, score_min, _, _ = parse_options(words[1:])
+        bank = util.normalize(''.join(args))
+        return {'results': scored(
+            wl.search_letter_bank(bank, score_min).items())}
+
+    if command == 'n':
+        args, score_min, _, _ = parse_options(words[1:])
+        if len(args) == 0:
+            raise ValueError('expected a word')
+
+        distance = int(args[1]) if len(args) > 1 else 1
+        return {'results': [[k, d, v] for k, d, v
+                            in wl.search_neighbors(util.normalize(args[0]),
+                                                   distance, score_min)]}
+
+    # Bare word
+    word = util.normalize(line)
+    matches, complete = wl.collect(wl.iter_search_substring(word, SCORE_MIN))
+    recorder.count('search', len(matches), wl.last_scan[0])
+    return partial({'exact': [[score, file]
+                              for score, file in wl.match_exact(word)],
+                    'results': scored(matches)}, complete)
+
+def partial(result: dict[str, Any], complete: bool) -> dict[str, Any]:
+    # Searches that stream can report what they found before the budget ran
+    # out; the rest just fail with an error.
+    if not complete:
+        result['incomplete'] = True
+
+    return result
+
+def answer(line: str) -> str:
+    """Run one query line against the shared wordlist, as a JSON line."""
+    assert _wordlist is not None
+
+    result: dict[str, Any] = {'query': line}
+    recorder.take()
+    try:
+        with recorder.timed('search'), _wordlist.time_budget(_budget):
+            result.update(run_query(_wordlist, line))
+    except Exception as e:
+        # re.error, bad numbers, etc. One bad query shouldn't stop a batch.
+        result['error'] = str(e)
+
+    if _with_stats:
+        result['stats'] = recorder.take()
+
+    return json.dumps(result)
+
+def read_queries(f: Iterable[str]) -> Iterator[str]:
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+# RUNNING #
+###########
+def run(wl: Wordlist, queries: Iterable[str], jobs: int = 1,
+        with_stats: bool = False, budget: float | None = None
+        ) -> Iterator[str]:
+    """Answer queries as JSON lines, in order, using jobs worker processes.
+    With with_stats, each line also has a 'stats' dump of its stage timings.
+    With a budget, each query stops after that many seconds, and is marked
+    incomplete.
+
+    Workers are forked after the wordlist is loaded, so they share its memory
+    copy-on-write."""
+    global _wordlist, _with_stats, _budget
+    _wordlist = wl
+    _with_stats = with_stats
+    _budget = budget
+
+    if jobs <= 1:
+        yield from map(answer, queries)
+        return
+
+    # Queries already run in parallel; a pool's workers can't start their
+    # own for sharded scans.
+    wl.scan_jobs = 1
+
+    # Build the indexes the common queries need before forking, so workers
+    # don't each build their own.
+    wl.positional_index()
+    wl.trigram_index()
+    wl.suffix_array()
+    wl.affix_index()
+
+    # Keep the collector from touching (and so copying) the shared objects.
+    gc.freeze()
+
+    with multiprocessing.get_context('fork').Pool(jobs) as pool:
+        yield from pool.imap(answer, queries, chunksize=16)
+
+def main(args: argparse.Namespace) -> None:
+    wl = Wordlist()
+    wl.load(args.files, jobs=args.jobs)
+
+    # Per-query timings come back from the workers; add them up here.
+    summary = Recorder()
+    summary.merge(recorder.dump())
+
+    queries = read_queries(args.queries)
+    for line in run(wl, queries, args.jobs, args.stats, args.budget):
+        print(line, flush=True)
+
+        if args.stats:
+            summary.merge(json.loads(line)['stats'])
+
+    if args.stats:
+        dump = {'stages': summary.dump(),
+                'lists': {name: {'words': words, 'bytes': size}
+                          for name, (words, size)
+                          in wl.memory_usage().items()}}
+        print(json.dumps(dump), file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Run REPL-syntax queries from a file or stdin, printing '
+        'JSON lines.')
+    parser.add_argument('files', nargs='+',
+                        help='wordlist files or directories to load')
+    parser.add_argument('-q', '--queries', type=argparse.FileType('r'),
+                        default=sys.stdin,
+                        help='file of queries, one per line (default: stdin)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='number of worker processes (default: one per '
+                        'core)')
+    parser.add_argument('--budget', type=float,
+                        help='stop each query after this many seconds')
+    parser.add_argument('--stats', action='store_true',
+                        help="add each query's stage timings to its output, "
+                        'and print totals as JSON to stderr at the end')
+
+    main(parser.parse_args())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+# Benchmarks for loading, searching and rendering.
+#
+# Generates deterministic, Broda-scale synthetic wordlists (or uses an
+# existing directory), runs timed scenarios against them, and reports wall
+# time and peak memory per scenario as JSON, so runs can be compared.
+#
+#   ./bench.py                      # full scale, temporary directory
+#   ./bench.py --scale 0.1 -o out.json
+#   ./bench.py --dir ../gh/wordlist/ --only load query_regex
+#
+# Lists are always benchmarked from a temporary copy, so compiled caches
+# (see wordcache.py) never end up in --dir. load times a cold load, with the
+# caches removed first; load_cached times loading from them.
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+import util
+import wordcache
+from wordlist import Wordlist
+
+# GENERATOR #
+#############
+
+ONSETS = ['', 'b', 'bl', 'br', 'c', 'ch', 'cl', 'cr', 'd', 'dr', 'f', 'fl',
+          'fr', 'g', 'gl', 'gr', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'pl', 'pr',
+          'qu', 'r', 's', 'sh', 'sl', 'sp', 'st', 'str', 't', 'th', 'tr', 'v',
+          'w', 'wh', 'y', 'z']
+VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ee', 'oo', 'ou', 'y']
+CODAS = ['', '', '', 'b', 'ck', 'd', 'ft', 'g', 'l', 'll', 'm', 'n', 'nd',
+         'ng', 'nt', 'p', 'r', 'rd', 'rt', 's', 'sh', 'st', 't', 'th', 'x']
+ENDINGS = ['', '', '', '', 's', 'ed', 'ing', 'er', 'ers', 'ly', 'ness', 'est']
+
+# (list name, share of the word pool, score weights)
+# Broda is the big one, mostly scored below 40; the others mostly overlap it.
+LISTS = [
+    ('000_peter_broda_full.txt', 1.0,
+     {10: 10, 20: 15, 25: 15, 30: 20, 35: 10, 40: 10, 50: 15, 60: 5}),
+    ('00_spreadthewordlist.txt', 0.5, {25: 30, 50: 60, 60: 10}),
+    ('01_XwiWordList.txt', 0.4, {20: 20, 30: 20, 40: 20, 50: 30, 60: 10}),
+    ('99_personal.txt', 0.01, {0: 20, 40: 20, 50: 30, 60: 30}),
+]
+
+# Roughly the size of the Broda list
+FULL_SCALE_WORDS = 600_000
+
+def generate_word(rng: random.Random) -> str:
+    syllables = rng.choices([1, 2, 3, 4], weights=[20, 40, 30, 10])[0]
+    word = ''.join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS)
+                   for _ in range(syllables))
+    return word + rng.choice(ENDINGS)
+
+def generate_words(count: int, rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    stems: list[str] = []
+
+    while len(words) < count:
+        # About a quarter are compounds of earlier words, like real
+        # crossword lists full of phrases.
+        if len(stems) > 100 and rng.random() < 0.25:
+            word = rng.choice(stems) + rng.choice(stems)
+        else:
+            word = generate_word(rng)
+            if len(word) <= 6:
+                stems.append(word)
+
+        if 3 <= len(word) <= 21:
+            words.add(word)
+
+    return sorted(words)
+
+def generate_wordlists(directory: Path, scale: float = 1.0, seed: int = 0
+                       ) -> list[Path]:
+    """Write deterministic word;score files into directory."""
+    rng = random.Random(seed)
+    pool = generate_words(int(FULL_SCALE_WORDS * scale), rng)
+
+    paths = []
+    for name, share, weights in LISTS:
+        words = rng.sample(pool, int(len(pool) * share))
+        scores = rng.choices(list(weights), weights=list(weights.values()),
+                             k=len(words))
+
+        path = directory / name
+        with open(path, 'w') as f:
+            for word, score in sorted(zip(words, scores)):
+                f.write(f"{word};{score}\n")
+
+        paths.append(path)
+
+    return paths
+
+# SCENARIOS #
+#############
+
+REGEXES = ['c..t.r', '.a.a.a', '.*sun.*day.*', '.*ing.*er', 'st.*ing',
+           '(..)\\1.*', '[aeiou]{4}.*']
+SUBSTRINGS = ['er', 'ing', 'tion', 'sun', 'quee', 'brook']
+SANDWICHES = ['blue', 'green', 'sun', 'window', 'lock', 'book', 'night']
+
+def scenarios(paths: list[Path]) -> dict[str, Callable[[Wordlist], Any]]:
+    wordplay = importlib.import_module('list')
+
+    def load(_: Wordlist) -> Wordlist:
+        for path in paths:
+            wordcache.cache_path(path).unlink(missing_ok=True)
+
+        return load_cached(_)
+
+    def load_cached(_: Wordlist) -> Wordlist:
+        wl = Wordlist()
+        wl.load([str(p) for p in paths])
+        return wl
+
+    def query(wl: Wordlist) -> None:
+        for word in SUBSTRINGS:
+            wl.match_exact(word)
+            wl.search_substring(word)
+
+    def query_regex(wl: Wordlist) -> None:
+        for regex in REGEXES:
+            wl.query_regex(regex, 40, 8, 15)
+
+    def query_sandwich(wl: Wordlist) -> None:
+        for word in SANDWICHES:
+            wl.query_sandwich(word)
+
+    def score_heavy(wl: Wordlist) -> None:
+        wordplay.print_upside_downs(wl)
+        wordplay.list_t_to_dos(wl)
+        wordplay.hotandsour(wl, 'st', 'br')
+
+    def tableize(wl: Wordlist) -> None:
+        words = sorted(wl.search_substring('e', 0))
+        util.tableize(['e', 'st'], words)
+
+    return {
+        'load': load,
+        'load_cached': load_cached,
+        'query': query,
+        'query_regex': query_regex,
+        'query_sandwich': query_sandwich,
+        'score_heavy': score_heavy,
+        'tableize': tableize,
+    }
+
+def measure(fn: Callable[[Wordlist], Any], wl: Wordlist, repeat: int
+            ) -> dict[str, float]:
+    """Wall time of the first run (which pays for lazily built indexes and
+    caches) and the best of repeat runs, then peak traced memory of one more
+    run (tracing slows things down, so it's kept out of the timing)."""
+    sink = io.StringIO()
+    times = []
+
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(wl)
+            times.append(time.perf_counter() - start)
+            sink.seek(0)
+            sink.truncate()
+
+        tracemalloc.start()
+        fn(wl)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {'first_seconds': times[0], 'wall_seconds': min(times),
+            'peak_bytes': peak}
+
+def run(paths: list[Path], only: list[str] | None, repeat: int
+        ) -> dict[str, Any]:
+    all_scenarios = scenarios(paths)
+
+    wl = Wordlist()
+    with contextlib.redirect_stderr(io.StringIO()):
+        wl.load([str(p) for p in paths])
+
+    results = {}
+    for name, fn in all_scenarios.items():
+        if only and name not in only:
+            continue
+
+        print(f"running {name}", file=sys.stderr)
+        results[name] = measure(fn, wl, repeat)
+
+    return {
+        'python': sys.version.split()[0],
+        'words': len(wl.scores),
+        'lists': {name: len(wl.data[name]) for name in wl.filelist},
+        'repeat': repeat,
+        'scenarios': results,
+    }
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            paths = [Path(shutil.copy(path, tmp))
+                     for path in Wordlist.wordlist_paths(args.dir)]
+        else:
+            print(f"generating wordlists (scale {args.scale})",
+                  file=sys.stderr)
+            paths = generate_wordlists(Path(tmp), args.scale, args.seed)
+
+        report = run(paths, args.only, args.repeat)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dir',
+                        help='benchmark existing wordlists instead of '
+                        'generated ones')
+    parser.add_argument('--generate', metavar='DIR',
+                        help='only write generated wordlists to DIR')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='size relative to the Broda list (default 1.0)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO')
+    parser.add_argument('-o', '--output', help='write JSON report here')
+
+    args = parser.parse_args()
+
+    if args.generate:
+        os.makedirs(args.generate, exist_ok=True)
+        generate_wordlists(Path(args.generate), args.scale, args.seed)
+    else:
+        main(args)
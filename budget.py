@@ -0,0 +1,40 @@
+import time
+
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class BudgetExceeded(Exception):
+    """A query ran past its time budget."""
+
+
+class Budget():
+    """Deadline for the current query.
+
+    Scan loops call check() every so often, which raises BudgetExceeded once
+    the deadline has passed, the same way Ctrl-C raises KeyboardInterrupt.
+    Results are streamed, so whatever was found before that can still be
+    used (see Wordlist.collect).
+    """
+
+    def __init__(self) -> None:
+        self.deadline: float | None = None
+
+    @contextmanager
+    def limit(self, seconds: float | None) -> Iterator[None]:
+        """Limit everything run (and streamed) inside the block to seconds.
+        None means no limit. Nested limits keep the earlier deadline."""
+        previous = self.deadline
+        if seconds is not None:
+            deadline = time.monotonic() + seconds
+            if previous is None or deadline < previous:
+                self.deadline = deadline
+
+        try:
+            yield
+        finally:
+            self.deadline = previous
+
+    def check(self) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded('query ran past its time budget')
@@ -0,0 +1,141 @@
+import json
+import os
+import socket
+
+from pathlib import Path
+from typing import Any
+
+# Thin client for server.py. It only needs the standard library, so tools
+# using it don't load the wordlist stack.
+
+def default_socket_path() -> Path:
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'wordlist.sock'
+
+    return Path(f'/tmp/wordlist-{os.getuid()}.sock')
+
+
+class ServerError(Exception):
+    pass
+
+
+class Client():
+    """Queries a running server.py, with the same methods (and results) as
+    the Wordlist it holds.
+
+        wl = Client()
+        wl.search_regex('c.t.r', 50)
+        wl.score('cater')
+
+    With a budget, the server stops each query after that many seconds, and
+    it fails with a ServerError.
+    """
+
+    def __init__(self, path: Path | str | None = None,
+                 budget: float | None = None) -> None:
+        self.budget = budget
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(str(path or default_socket_path()))
+        self.file = self.socket.makefile('rwb')
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        request = {'method': method, 'args': args, 'kwargs': kwargs,
+                   'budget': self.budget}
+        self.file.write(json.dumps(request).encode() + b'\n')
+        self.file.flush()
+
+        line = self.file.readline()
+        if not line:
+            raise ServerError('server closed the connection')
+
+        response = json.loads(line)
+        if 'error' in response:
+            raise ServerError(response['error'])
+
+        return response['result']
+
+    # QUERIES #
+    ###########
+    def match_exact(self, word: str) -> list[tuple[int, str]]:
+        return [(score, file)
+                for score, file in self.call('match_exact', word)]
+
+    def score(self, word: str, score_minimum: int = 0) -> tuple[bool, int]:
+        contains, score = self.call('score', word, score_minimum)
+        return contains, score
+
+    def contains(self, word: str, score_minimum: int = 0) -> bool:
+        return bool(self.call('contains', word, score_minimum))
+
+    def search_regex(self,
+                     regex: str,
+                     score_minimum: int = 40,
+                     score_maximum: int | None = None,
+                     len_min: int | None = None,
+                     len_max: int | None = None
+                     ) -> dict[str, int]:
+        return dict(self.call('search_regex', regex, score_minimum,
+                              score_maximum, len_min, len_max))
+
+    def search_substring(self,
+                         word: str,
+                         score_minimum: int = 40,
+                         score_maximum: int | None = None
+                         ) -> dict[str, int]:
+        return dict(self.call('search_substring', word, score_minimum,
+                              score_maximum))
+
+    def search_sandwich(self,
+                        word: str,
+                        score_minimum: int = 40,
+                        score_maximum: int | None = None
+                        ) -> list[tuple[str, str, dict[str, int]]]:
+        return [(prefix, suffix, matches)
+                for prefix, suffix, matches
+                in self.call('search_sandwich', word, score_minimum,
+                             score_maximum)]
+
+    def search_anagram(self,
+                       letters: str,
+                       score_minimum: int = 40,
+                       score_maximum: int | None = None
+                       ) -> list[tuple[str, dict[str, int]]]:
+        return [(label, matches)
+                for label, matches
+                in self.call('search_anagram', letters, score_minimum,
+                             score_maximum)]
+
+    def search_letter_bank(self,
+                           bank: str,
+                           score_minimum: int = 40,
+                           score_maximum: int | None = None,
+                           min_length: int = 3
+                           ) -> dict[str, int]:
+        return dict(self.call('search_letter_bank', bank, score_minimum,
+                              score_maximum, min_length))
+
+    def search_neighbors(self,
+                         word: str,
+                         distance: int = 1,
+                         score_minimum: int = 40,
+                         score_maximum: int | None = None
+                         ) -> list[tuple[str, int, int]]:
+        return [(match, match_distance, score)
+                for match, match_distance, score
+                in self.call('search_neighbors', word, distance,
+                             score_minimum, score_maximum)]
+
+    def stats(self) -> dict[str, Any]:
+        """The server's stage timings, and { list: (words, bytes) }."""
+        return dict(self.call('stats'))
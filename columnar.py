@@ -0,0 +1,154 @@
+import numpy as np
+
+from typing import Callable
+from typing import Iterator
+from typing import Mapping
+
+from wordlist import Wordlist
+from wordtable import ScoreList
+
+
+class ColumnarWordlist(Wordlist):
+    """Wordlist backed by NumPy columns instead of per-word tuples.
+
+    Rows are word table ids. Per-file scores live in one (word x list)
+    matrix, and effective scores and lengths in arrays, so score and length
+    filters are applied as vectorized masks before any Python-level
+    match_fn runs.
+
+    Drop-in replacement: search (through iter_search), score, contains and
+    match_exact keep the Wordlist signatures and results.
+    """
+
+    # Marks a word missing from a list in self.matrix, and ignored words in
+    # self.effective.
+    ABSENT = -1
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.matrix = np.empty((0, 0), dtype=np.int16)
+        self.effective = np.empty(0, dtype=np.int16)
+        self.lengths = np.empty(0, dtype=np.int16)
+
+        # Sharded regex scans would go around iter_search and its masks, so
+        # scan in process.
+        self.scan_jobs = 1
+
+    def _build_file_scores(self, files: list[Mapping[str, int]]) -> None:
+        # Lists that aren't ScoreLists (the score journal) may have words
+        # the table doesn't yet.
+        table = self.table
+        for words in files:
+            if not isinstance(words, ScoreList):
+                table.intern_all(list(words))
+
+        self.matrix = np.full((len(table), len(files)), self.ABSENT,
+                              dtype=np.int16)
+        effective = np.full(len(table), self.ABSENT, dtype=np.int16)
+        ignored = np.zeros(len(table), dtype=bool)
+
+        for column, words in enumerate(files):
+            if isinstance(words, ScoreList):
+                ids = np.frombuffer(words.ids, dtype=np.uint32)
+                scores = np.frombuffer(words.scores, dtype=np.int16)[ids]
+            else:
+                ids = np.fromiter(map(table.ids.__getitem__, words),
+                                  dtype=np.uint32, count=len(words))
+                scores = np.fromiter(words.values(), dtype=np.int16,
+                                     count=len(words))
+
+            self.matrix[ids, column] = scores
+            # Later lists have higher precedence
+            effective[ids] = scores
+            ignored[ids[scores == 0]] = True
+
+        effective[ignored] = self.ABSENT
+        self.effective = effective
+        self.lengths = np.fromiter(map(len, table.words), dtype=np.int16,
+                                   count=len(table))
+
+        # Everything that reads per-file scores is overridden below.
+        self.file_scores = {}
+
+    def _patch_index(self, name: str, old: Mapping[str, int],
+                     new: Mapping[str, int]) -> None:
+        # New words would need new matrix rows; just rebuild.
+        self._build_index()
+
+    def _row(self, word: str) -> int | None:
+        """Matrix row of word, or None if it has none."""
+        i = self.table.ids.get(word)
+        if i is None or i >= len(self.matrix):
+            return None
+
+        return i
+
+    def match_exact(self, word: str) -> list[tuple[int, str]]:
+        i = self._row(word)
+        if i is None:
+            return []
+
+        return [(int(score), file)
+                for score, file in zip(self.matrix[i], self.filelist)
+                if score != self.ABSENT]
+
+    def score(self, word: str, score_minimum: int = 0) -> tuple[bool, int]:
+        i = self._row(word)
+        if i is None:
+            return False, 0
+
+        max_score = 0
+        contains = False
+
+        for file_score in self.matrix[i].tolist():
+            if file_score != self.ABSENT and file_score >= score_minimum:
+                if file_score == 0:
+                    return False, 0
+
+                max_score = file_score
+                contains = True
+
+        return contains, max_score
+
+    def iter_search(self,
+                    match_fn: Callable[[str], bool],
+                    score_minimum: int = 40,
+                    score_maximum: int | None = None,
+                    len_min: int | None = None,
+                    len_max: int | None = None,
+                    candidates: list[str] | None = None
+                    ) -> Iterator[tuple[str, int]]:
+        # Index candidates are usually few; checking them directly is cheaper
+        # than building masks over every word.
+        if candidates is not None:
+            yield from super().iter_search(match_fn, score_minimum,
+                                           score_maximum, len_min, len_max,
+                                           candidates)
+            return
+
+        # Ignored words are ABSENT, which is below any score minimum.
+        mask = self.effective >= max(score_minimum, 0)
+
+        if score_maximum:
+            mask &= self.effective <= score_maximum
+
+        if len_min:
+            mask &= self.lengths >= len_min
+
+        if len_max:
+            mask &= self.lengths <= len_max
+
+        ids = np.flatnonzero(mask)
+        self.last_scan = (len(ids), len(self.scores))
+
+        words = self.table.words
+        effective = self.effective
+
+        for n, i in enumerate(ids.tolist()):
+            if n % self.CHECK_EVERY == 0:
+                self.budget.check()
+
+            word = words[i]
+            if match_fn(word):
+                yield word, int(effective[i])
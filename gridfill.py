@@ -0,0 +1,288 @@
+import re
+
+from typing import Callable
+from typing import Iterator
+
+from positional import letter_bitsets
+
+# Crossword grid filling (see Wordlist.search_fill).
+#
+# A grid is a set of slots, each a run of cells to fill with one word. Slots
+# cross where they share a cell. The filler keeps, for every slot, the set of
+# candidate words still possible as a bitset, and after each choice narrows
+# the crossing slots down to words agreeing on the shared letters until
+# nothing changes (arc consistency). It always branches on the slot with the
+# fewest candidates left, trying higher scoring words first.
+
+# (row, column)
+Cell = tuple[int, int]
+
+
+class Slot():
+    """A run of cells filled with one word, e.g. 1A (1 across)."""
+
+    def __init__(self, name: str, cells: list[Cell]) -> None:
+        self.name = name
+        self.cells = cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r}, {self.cells!r})"
+
+    def pattern(self, letters: dict[Cell, str]) -> str:
+        """Fill pattern for the slot, e.g. c..t., from the letters given."""
+        return ''.join([letters.get(cell, '.') for cell in self.cells])
+
+
+class Grid():
+    """Slots to fill, and the letters already in place.
+
+    Usually parsed from rows, where # is a block, . is an empty cell and
+    anything else is a given letter:
+
+        Grid.parse('c..../...../...##')
+
+    Every across or down run of two or more cells is a slot, numbered the
+    way crosswords are.
+    """
+
+    BLOCK = '#'
+    EMPTY = '.'
+
+    # Rows are separated by newlines or slashes
+    ROW_SEPARATOR = re.compile('[/\n]')
+
+    def __init__(self, slots: list[Slot],
+                 letters: dict[Cell, str] | None = None) -> None:
+        self.slots = slots
+        self.letters = letters or {}
+
+        # self.crossings is a list, per slot, of (position, other slot,
+        # position in other slot) for every cell it shares.
+        slots_by_cell: dict[Cell, list[tuple[int, int]]] = {}
+        for i, slot in enumerate(slots):
+            for position, cell in enumerate(slot.cells):
+                slots_by_cell.setdefault(cell, []).append((i, position))
+
+        self.crossings: list[list[tuple[int, int, int]]] = [[] for _ in slots]
+        for sharing in slots_by_cell.values():
+            for i, position in sharing:
+                self.crossings[i].extend([(position, j, other_position)
+                                          for j, other_position in sharing
+                                          if j != i])
+
+    @classmethod
+    def parse(cls, text: str) -> 'Grid':
+        rows = [row.strip().lower() for row in cls.ROW_SEPARATOR.split(text)]
+        rows = [row for row in rows if row]
+        width = max(map(len, rows), default=0)
+
+        # Short rows are padded with blocks
+        cells = [row.ljust(width, cls.BLOCK) for row in rows]
+        letters = {(r, c): char
+                   for r, row in enumerate(cells)
+                   for c, char in enumerate(row)
+                   if char not in (cls.BLOCK, cls.EMPTY)}
+
+        def is_open(r: int, c: int) -> bool:
+            return (0 <= r < len(cells) and 0 <= c < width and
+                    cells[r][c] != cls.BLOCK)
+
+        def run(r: int, c: int, dr: int, dc: int) -> list[Cell]:
+            found = []
+            while is_open(r, c):
+                found.append((r, c))
+                r, c = r + dr, c + dc
+
+            return found
+
+        slots = []
+        number = 0
+        for r in range(len(cells)):
+            for c in range(width):
+                if not is_open(r, c):
+                    continue
+
+                across = run(r, c, 0, 1) if not is_open(r, c - 1) else []
+                down = run(r, c, 1, 0) if not is_open(r - 1, c) else []
+                if len(across) < 2 and len(down) < 2:
+                    continue
+
+                number += 1
+                if len(across) >= 2:
+                    slots.append(Slot(f"{number}A", across))
+                if len(down) >= 2:
+                    slots.append(Slot(f"{number}D", down))
+
+        return cls(slots, letters)
+
+    def patterns(self) -> list[str]:
+        return [slot.pattern(self.letters) for slot in self.slots]
+
+    def render(self, letters: dict[Cell, str]) -> list[str]:
+        """Rows of the grid with letters filled in."""
+        cells = {cell for slot in self.slots for cell in slot.cells}
+        if not cells:
+            return []
+
+        height = max(r for r, _ in cells) + 1
+        width = max(c for _, c in cells) + 1
+        return [''.join([letters.get((r, c), self.EMPTY) if (r, c) in cells
+                         else self.BLOCK for c in range(width)])
+                for r in range(height)]
+
+
+class Fill():
+    """One way to fill every slot of a grid."""
+
+    def __init__(self, grid: Grid, words: list[str], scores: list[int]
+                 ) -> None:
+        self.grid = grid
+        self.words = words
+        self.scores = scores
+
+    @property
+    def score(self) -> float:
+        """Mean score of the words."""
+        return sum(self.scores) / max(len(self.scores), 1)
+
+    def rank(self) -> tuple[float, int]:
+        """Sort key, best first: mean score, then the weakest word."""
+        return (-self.score, -min(self.scores, default=0))
+
+    def letters(self) -> dict[Cell, str]:
+        return {cell: letter
+                for slot, word in zip(self.grid.slots, self.words)
+                for cell, letter in zip(slot.cells, word)}
+
+    def entries(self) -> dict[str, str]:
+        """{ slot name: word }"""
+        return {slot.name: word
+                for slot, word in zip(self.grid.slots, self.words)}
+
+    def render(self) -> list[str]:
+        return self.grid.render(self.letters())
+
+
+class SlotCandidates():
+    """A slot's candidate words, best first, with a bitset per (position,
+    letter) like PositionalIndex, so narrowing the slot down to words with a
+    given letter somewhere is one AND."""
+
+    def __init__(self, length: int, words: dict[str, int]) -> None:
+        ranked = sorted(words.items(), key=lambda item: (-item[1], item[0]))
+        self.words = [word for word, _ in ranked if len(word) == length]
+        self.scores = [score for word, score in ranked if len(word) == length]
+        self.all = (1 << len(self.words)) - 1
+
+        # self.bitsets is a list, per position, of { letter: bitset }
+        self.bitsets = letter_bitsets(self.words, length)
+
+
+class GridFiller():
+    """Depth-first search for fills of a grid.
+
+    candidates has the words (and scores) allowed in each slot, in grid
+    order; check is called at every step, and may raise to stop the search
+    (e.g. Budget.check)."""
+
+    def __init__(self, grid: Grid, candidates: list[dict[str, int]],
+                 check: Callable[[], None] = lambda: None) -> None:
+        self.grid = grid
+        self.check = check
+        self.slots = [SlotCandidates(len(slot), words)
+                      for slot, words in zip(grid.slots, candidates)]
+
+    def fills(self) -> Iterator[Fill]:
+        """Yield every fill, roughly best first. Fills repeating a word
+        aren't allowed."""
+        domains = [slot.all for slot in self.slots]
+
+        # A slot nothing fits (crossing slots or not) means there's no fill.
+        if not all(domains) or \
+                not self.propagate(domains, set(range(len(domains)))):
+            return
+
+        yield from self._search(domains)
+
+    def _search(self, domains: list[int]) -> Iterator[Fill]:
+        self.check()
+
+        # Most constrained slot still open
+        best = None
+        best_count = 0
+        for i, domain in enumerate(domains):
+            count = domain.bit_count()
+            if count == 0:
+                return
+
+            if count > 1 and (best is None or count < best_count):
+                best, best_count = i, count
+
+        if best is None:
+            fill = self._fill(domains)
+            if fill is not None:
+                yield fill
+            return
+
+        # Lowest bits are the best scoring words
+        taken = self._taken(domains)
+        remaining = domains[best]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+
+            if self.slots[best].words[bit.bit_length() - 1] in taken:
+                continue
+
+            narrowed = list(domains)
+            narrowed[best] = bit
+            if self.propagate(narrowed, {best}):
+                yield from self._search(narrowed)
+
+    def propagate(self, domains: list[int], changed: set[int]) -> bool:
+        """Narrow domains in place until every crossing letter some slot
+        allows is allowed by the slot crossing it too. Returns False if a
+        slot runs out of words."""
+        while changed:
+            i = changed.pop()
+            for position, j, other_position in self.grid.crossings[i]:
+                letters = self._letters(i, domains[i], position)
+
+                other = self.slots[j].bitsets[other_position]
+                allowed = 0
+                for letter in letters:
+                    allowed |= other.get(letter, 0)
+
+                domain = domains[j] & allowed
+                if not domain:
+                    return False
+
+                if domain != domains[j]:
+                    domains[j] = domain
+                    changed.add(j)
+
+        return True
+
+    def _letters(self, i: int, domain: int, position: int) -> list[str]:
+        """Letters at position over the words still in slot i."""
+        return [letter
+                for letter, bitset in self.slots[i].bitsets[position].items()
+                if domain & bitset]
+
+    def _taken(self, domains: list[int]) -> set[str]:
+        """Words already decided on."""
+        return {self.slots[i].words[domain.bit_length() - 1]
+                for i, domain in enumerate(domains)
+                if domain.bit_count() == 1}
+
+    def _fill(self, domains: list[int]) -> Fill | None:
+        indexes = [domain.bit_length() - 1 for domain in domains]
+        words = [slot.words[i] for slot, i in zip(self.slots, indexes)]
+        if len(set(words)) < len(words):
+            return None
+
+        scores = [slot.scores[i] for slot, i in zip(self.slots, indexes)]
+        return Fill(self.grid, words, scores)
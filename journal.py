@@ -0,0 +1,132 @@
+import os
+
+from pathlib import Path
+from typing import BinaryIO
+from typing import Collection
+
+import util
+
+
+class ScoreJournal():
+    """Append-only log of score changes for a wordlist.
+
+    Each change is appended to .<list name>.journal next to the list as a
+    word;score line and fsynced, so edits are O(1) and survive a crash. A
+    final line torn by a crash (no newline) is skipped on replay, and cut
+    off by the next append. compact() folds the journal into the list file
+    and empties it. Replaying a journal over a list it was already folded
+    into changes nothing, so a crash mid-compact is safe too.
+    """
+
+    def __init__(self, list_path: Path) -> None:
+        self.list_path = list_path
+        self.path = list_path.parent / f'.{list_path.name}.journal'
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def read(self) -> dict[str, int]:
+        """Replay the journal, returning the latest score for each word."""
+        scores: dict[str, int] = {}
+
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    # A final line without a newline was torn by a crash
+                    # mid-append; its score may be cut short.
+                    if not line.endswith('\n'):
+                        break
+
+                    split = line.strip().split(';')
+                    if len(split) < 2:
+                        continue
+
+                    try:
+                        scores[split[0]] = int(split[1])
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+
+        return scores
+
+    def append(self, word: str, score: int) -> None:
+        with open(self.path, 'a+b') as f:
+            # Drop a line torn by a crash mid-append, as read() does, so the
+            # edit isn't joined onto it.
+            f.truncate(self._clean_length(f))
+
+            f.write(f"{word};{score}\n".encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _clean_length(f: BinaryIO) -> int:
+        """Length of the file up to and including its last newline."""
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            start = max(position - 4096, 0)
+            f.seek(start)
+            chunk = f.read(position - start)
+
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                return start + newline + 1
+
+            position = start
+
+        return 0
+
+    def compact(self, keep: Collection[str] = ()) -> int:
+        """Rewrite the list file with the journal's scores applied, then
+        empty the journal, except for the words in keep. Returns the number
+        of words written."""
+        journal = self.read()
+        scores = {word: score for word, score in journal.items()
+                  if word not in keep}
+        if not scores:
+            return 0
+
+        pending = dict(scores)
+        lines = []
+
+        if self.list_path.exists():
+            with open(self.list_path) as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    split = line.split(';')
+                    word = util.normalize(split[0])
+
+                    # Keep the original spelling and any comments
+                    if len(split) >= 2 and word in pending:
+                        split[1] = str(pending.pop(word))
+                        line = ';'.join(split)
+
+                    lines.append(line)
+
+        lines.extend(f"{word};{score}" for word, score in pending.items())
+
+        tmp = self.list_path.with_name(f'.{self.list_path.name}.tmp')
+        with open(tmp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, self.list_path)
+
+        kept = [f"{word};{score}\n" for word, score in journal.items()
+                if word in keep]
+        if kept:
+            tmp = self.path.with_name(f'{self.path.name}.tmp')
+            with open(tmp, 'w') as f:
+                f.write(''.join(kept))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp, self.path)
+        else:
+            os.unlink(self.path)
+
+        return len(scores)
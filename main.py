@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 
-import sys
+import argparse
 import re
+import time
 
 import cmd
 
+from budget import BudgetExceeded
 from wordlist import Wordlist
 from util import Color
+import transforms
+import util
+from stats import recorder
+import stats
 
 class Shell(cmd.Cmd):
     intro = 'Welcome.'
@@ -16,10 +22,39 @@ class Shell(cmd.Cmd):
     len_regex = re.compile('[0-9]+-[0-9]+')
     score_regex = re.compile('[0-9]+\\+')
 
-    def __init__(self, wordlist: Wordlist):
+    def __init__(self, wordlist: Wordlist, auto_reload: bool = True,
+                 timing: bool = False, budget: float | None = None,
+                 pager: bool = True):
         self.wordlist = wordlist
+        self.auto_reload = auto_reload
+        self.timing = timing
+        self.budget = self.seconds_or_none(budget)
+        self.pager = pager
         super(Shell, self).__init__()
 
+    def cmdloop(self, intro: str | None = None) -> None:
+        # ^C at the prompt clears the line instead of exiting.
+        while True:
+            try:
+                super(Shell, self).cmdloop(intro)
+                return
+            except KeyboardInterrupt:
+                print('^C')
+                intro = ''
+
+    def onecmd(self, line: str) -> bool:
+        # ^C or the time budget stops the command, not the shell. Searches
+        # that can show partial results catch these themselves. Output that
+        # outgrows the terminal continues in a pager.
+        with util.paged(self.pager):
+            try:
+                with self.wordlist.time_budget(self.budget):
+                    return super(Shell, self).onecmd(line)
+            except (KeyboardInterrupt, BudgetExceeded):
+                print()
+                self.wordlist.print_incomplete()
+                return False
+
     def default(self, arg: str) -> None:
         '''
         Enter a bare word to do a basic query, with full match and substring
@@ -70,24 +105,341 @@ class Shell(cmd.Cmd):
         '''
         self.wordlist.query_sandwich(arg)
 
+    def do_h(self, arg: str) -> None:
+        '''
+        Join two prefixes hot-and-sour style: h hot sour [50+]. Finds words
+        made of what follows the first prefix plus what follows the second.
+        '''
+        words: list[str] = arg.split(' ')
+
+        if len(words) < 2:
+            print("expected two prefixes")
+            return
+
+        w1, w2 = words[0], words[1]
+        score_min: int = 50
+
+        for word in words[2:]:
+            if self.score_regex.fullmatch(word):
+                score_min = int(word[:-1])
+
+        self.wordlist.query_compound(w1, w2, score_min)
+
+    def do_t(self, arg: str) -> None:
+        '''
+        Find words that are still words after a transform:
+
+        t replace b d     (b -> d everywhere)
+        t strip air       (remove air from inside the word)
+        t prefix hot sour (hot... -> sour...)
+        t reverse
+        t upsidedown
+
+        Add N+ for a minimum score on the original word.
+        '''
+        words: list[str] = arg.split()
+        score_min: int = 40
+
+        args = []
+        for word in words:
+            if self.score_regex.fullmatch(word):
+                score_min = int(word[:-1])
+            else:
+                args.append(word)
+
+        if len(args) == 0:
+            print("expected a transform")
+            return
+
+        kind, args = args[0], args[1:]
+        transform: transforms.Transform
+
+        try:
+            if kind == 'replace':
+                transform = transforms.Replace(args[0], args[1])
+            elif kind == 'strip':
+                transform = transforms.Strip(args[0])
+            elif kind == 'prefix':
+                transform = transforms.SwapPrefix(args[0], args[1])
+            elif kind == 'reverse':
+                transform = transforms.Reverse()
+            elif kind == 'upsidedown':
+                transform = transforms.upside_down()
+            else:
+                print(f"unknown transform: {kind}")
+                return
+        except IndexError:
+            print(f"not enough arguments for {kind}")
+            return
+
+        self.wordlist.query_transform(transform, score_min)
+
+    def do_a(self, arg: str) -> None:
+        '''
+        Anagram search: a letters [N+]. Also shows anagrams with one letter
+        added or dropped.
+        '''
+        letters, score_min = self.parse_letters(arg)
+        if letters:
+            self.wordlist.query_anagram(letters, score_min)
+
+    def do_b(self, arg: str) -> None:
+        '''
+        Letter bank search: b letters [N+]. Finds words that can be spelled
+        using each letter at most as often as it appears.
+        '''
+        letters, score_min = self.parse_letters(arg)
+        if letters:
+            self.wordlist.query_letter_bank(letters, score_min)
+
+    def parse_letters(self, arg: str) -> tuple[str, int]:
+        words: list[str] = arg.split()
+        letters: str = ''
+        score_min: int = 40
+
+        for word in words:
+            if self.score_regex.fullmatch(word):
+                score_min = int(word[:-1])
+            else:
+                letters += word
+
+        if not letters:
+            print("expected letters")
+
+        return letters, score_min
+
+    def do_n(self, arg: str) -> None:
+        '''
+        Find near misses: n word [distance] [N+]. Lists words within an edit
+        distance (default 1) of word.
+        '''
+        words: list[str] = arg.split()
+
+        if len(words) == 0:
+            print("expected a word")
+            return
+
+        search_term: str = words[0]
+        distance: int = 1
+        score_min: int = 40
+
+        for word in words[1:]:
+            if word.isdigit():
+                distance = int(word)
+
+            if self.score_regex.fullmatch(word):
+                score_min = int(word[:-1])
+
+        self.wordlist.query_neighbors(search_term, distance, score_min)
+
+    def do_g(self, arg: str) -> None:
+        '''
+        Fill a crossword grid: g rows [N+] [count]. Rows are separated by /,
+        with # for blocks, . for empty cells and letters for given ones, e.g.
+        g c..../...../.....#/....## 50+. Shows the best count fills (default
+        5) found within 10 seconds, or the budget if it's shorter.
+        '''
+        words: list[str] = arg.split()
+
+        if len(words) == 0:
+            print("expected a grid")
+            return
+
+        grid: str = words[0]
+        score_min: int = 50
+        max_fills: int = 5
+
+        for word in words[1:]:
+            if word.isdigit():
+                max_fills = int(word)
+
+            if self.score_regex.fullmatch(word):
+                score_min = int(word[:-1])
+
+        self.wordlist.query_fill(grid, score_min, max_fills)
+
+    def do_cache(self, arg: str) -> None:
+        '''
+        Show query cache hits and misses. 'cache clear' empties it.
+        '''
+        if arg.strip() == 'clear':
+            self.wordlist.cache.clear()
+
+        self.wordlist.print_cache_stats()
+
+    def do_up(self, arg: str) -> None:
+        '''
+        Upscore a word: up word [score]. Without a score, raises it by 10.
+        Needs --personal; edits are journaled until 'compact'.
+        '''
+        self.rescore(arg, 10)
+
+    def do_down(self, arg: str) -> None:
+        '''
+        Downscore a word: down word [score]. Without a score, lowers it by
+        10. A score of 0 ignores the word.
+        '''
+        self.rescore(arg, -10)
+
+    def rescore(self, arg: str, step: int) -> None:
+        if self.wordlist.journal is None:
+            print("no personal list (start with --personal)")
+            return
+
+        words: list[str] = arg.split()
+
+        if len(words) == 0:
+            print("expected a word")
+            return
+
+        if words[-1].isdigit():
+            word, score = ' '.join(words[:-1]), int(words[-1])
+        else:
+            word = ' '.join(words)
+            _, current = self.wordlist.score(util.normalize(word))
+            score = min(max((current or 50) + step, 0), 100)
+
+        if not word:
+            print("expected a word")
+            return
+
+        self.wordlist.set_score(word, score)
+
+        # Just the word's scores per list; a full query's substring search
+        # could cost more than the edit itself.
+        normalized = util.normalize(word)
+        self.wordlist.print_wordlist_matches(
+            word, self.wordlist.match_exact(normalized))
+
+    def do_compact(self, _: str) -> None:
+        '''
+        Write journaled score edits into the personal list.
+        '''
+        if self.wordlist.journal is None:
+            print("no personal list (start with --personal)")
+            return
+
+        count = self.wordlist.compact_journal()
+        print(f"wrote {count} words to {self.wordlist.journal.list_path}")
+
+    def do_stats(self, arg: str) -> None:
+        '''
+        Show time spent loading, indexing, parsing regexes, searching and
+        rendering, and memory per list. 'stats reset' clears the timings.
+        '''
+        if arg.strip() == 'reset':
+            recorder.reset()
+
+        self.wordlist.print_stats()
+
+    def do_timing(self, _: str) -> None:
+        '''
+        Toggle a timing footer after each command.
+        '''
+        self.timing = not self.timing
+        print(f"timing {'on' if self.timing else 'off'}")
+
+    def do_budget(self, arg: str) -> None:
+        '''
+        Set a time limit per command, in seconds: budget 2.5. 'budget off'
+        removes it, as does 0. Searches stopped by it (or by ^C) show what
+        they found.
+        '''
+        arg = arg.strip()
+        if arg == 'off':
+            self.budget = None
+        elif arg:
+            try:
+                self.budget = self.seconds_or_none(float(arg))
+            except ValueError:
+                print(f"not a number of seconds: {arg}")
+                return
+
+        print(f"budget: "
+              f"{f'{self.budget:g}s' if self.budget is not None else 'off'}")
+
+    @staticmethod
+    def seconds_or_none(seconds: float | None) -> float | None:
+        # A budget of 0 (or less) would stop every search at once; take it
+        # as no budget.
+        if seconds is None or seconds <= 0:
+            return None
+
+        return seconds
+
     def do_EOF(self, _: str) -> bool:
         print()
         return True
 
+    def do_reload(self, _: str) -> None:
+        '''
+        Re-read wordlists that changed on disk. This also happens
+        automatically before every command.
+        '''
+        if not self.reload():
+            print("no changes")
+
+    def reload(self) -> list[str]:
+        start = time.perf_counter()
+        changed = self.wordlist.reload()
+
+        if changed:
+            elapsed = (time.perf_counter() - start) * 1000
+            print(Color.grey(f"reloaded {', '.join(changed)} "
+                             f"({elapsed:.0f} ms)"))
+
+        return changed
+
     def precmd(self, line: str) -> str:
+        # Polls file sizes and mtimes; cheap next to any search.
+        if self.auto_reload:
+            self.reload()
+
+        # Only time the command itself
+        recorder.take()
+
         return line
 
-def main(args: list[str]) -> None:
+    def postcmd(self, stop: bool, line: str) -> bool:
+        taken = recorder.take()
+        if self.timing and taken:
+            print(Color.grey(stats.footer(taken)))
+
+        return stop
+
+def main(args: argparse.Namespace) -> None:
     wl = Wordlist()
-    wl.load(args)
+    if args.columnar:
+        from columnar import ColumnarWordlist
+        wl = ColumnarWordlist()
 
-    Shell(wl).cmdloop()
+    wl.load(args.files, jobs=args.jobs)
 
-if __name__ == "__main__":
-    args = sys.argv
+    if args.personal:
+        wl.attach_journal(args.personal)
+
+    Shell(wl, auto_reload=not args.no_reload, timing=args.timing,
+          budget=args.budget, pager=not args.no_pager).cmdloop()
 
-    if len(args) < 2:
-        print("expected wordlist files to load")
-        exit(1)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('files', nargs='+',
+                        help='wordlist files or directories to load')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes to parse wordlists with')
+    parser.add_argument('--columnar', action='store_true',
+                        help='use the NumPy columnar backend (needs numpy)')
+    parser.add_argument('-p', '--personal',
+                        help='wordlist that up/down score edits are '
+                        'written to')
+    parser.add_argument('--budget', type=float,
+                        help='stop each command after this many seconds')
+    parser.add_argument('--timing', action='store_true',
+                        help='print how long each command took')
+    parser.add_argument('--no-pager', action='store_true',
+                        help="don't page output taller than the terminal")
+    parser.add_argument('--no-reload', action='store_true',
+                        help="don't check for changed wordlists before "
+                        "each command")
 
-    main(args[1:])
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+from collections import defaultdict
+from typing import Any
+from typing import Iterable
+
+import Levenshtein
+
+
+class BKTree():
+    """Burkhard-Keller tree under Levenshtein distance.
+
+    Each child hangs off its parent by their distance. By the triangle
+    inequality, a query within distance k of the parent's word d only needs
+    to visit the children at distances d - k to d + k.
+    """
+
+    def __init__(self) -> None:
+        # A node is [word, { distance: child node }]
+        self.root: list[Any] | None = None
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = [word, {}]
+            return
+
+        node = self.root
+        while True:
+            distance = Levenshtein.distance(word, node[0])
+            if distance == 0:
+                return
+
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+
+            node = child
+
+    def within(self, word: str, k: int) -> list[tuple[str, int]]:
+        """Return (word, distance) for every word within distance k."""
+        if self.root is None:
+            return []
+
+        results = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = Levenshtein.distance(word, node_word)
+            if distance <= k:
+                results.append((node_word, distance))
+
+            for child_distance, child in children.items():
+                if distance - k <= child_distance <= distance + k:
+                    stack.append(child)
+
+        return results
+
+
+class NeighborIndex():
+    """Approximate-match index: one BK-tree per word length.
+
+    Words within distance k of a word differ in length by at most k, so a
+    query only visits 2k + 1 small trees. Trees are built the first time
+    their length is needed.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        # self.buckets is a dict { length: [word] }
+        self.buckets: dict[int, list[str]] = defaultdict(list)
+        for word in words:
+            self.buckets[len(word)].append(word)
+
+        self.trees: dict[int, BKTree] = {}
+
+    def add(self, words: Iterable[str]) -> None:
+        for word in words:
+            self.buckets[len(word)].append(word)
+
+            tree = self.trees.get(len(word))
+            if tree is not None:
+                tree.add(word)
+
+    def _tree(self, length: int) -> BKTree:
+        if length not in self.trees:
+            tree = BKTree()
+            for word in self.buckets.get(length, []):
+                tree.add(word)
+            self.trees[length] = tree
+
+        return self.trees[length]
+
+    def within(self, word: str, k: int = 1) -> list[tuple[str, int]]:
+        """Return (word, distance) for every word within edit distance k,
+        closest first."""
+        results = []
+        for length in range(max(len(word) - k, 1), len(word) + k + 1):
+            if length in self.buckets:
+                results.extend(self._tree(length).within(word, k))
+
+        results.sort(key=lambda t: (t[1], t[0]))
+        return results
@@ -0,0 +1,103 @@
+import re
+
+from collections import defaultdict
+from typing import Iterable
+
+
+class PositionalIndex():
+    """Index for fixed-length fill patterns like c..t.r.
+
+    Words are bucketed by length. Each bucket gets a bitset per (position,
+    letter), where bit i is set if the bucket's i-th word has that letter at
+    that position. A pattern is answered by intersecting the bitsets of its
+    letters, instead of matching a regex against every word.
+    """
+
+    # Letters and wildcards only; anything else needs the regex engine.
+    FILL_PATTERN = re.compile('[a-z0-9.]+')
+
+    def __init__(self, words: Iterable[str]) -> None:
+        # self.buckets is a dict { length: [word] }
+        self.buckets: dict[int, list[str]] = defaultdict(list)
+        for word in words:
+            self.buckets[len(word)].append(word)
+
+        # Bitsets are built per length on first use, since most sessions only
+        # touch a few lengths.
+        # self.bitsets is a dict { length: [{ letter: bitset }] }, with one
+        # dict per position.
+        self.bitsets: dict[int, list[dict[str, int]]] = {}
+
+    def add(self, words: Iterable[str]) -> None:
+        """Add words, dropping the bitsets of the lengths they change."""
+        for word in words:
+            self.buckets[len(word)].append(word)
+            self.bitsets.pop(len(word), None)
+
+    @classmethod
+    def is_fill_pattern(cls, pattern: str) -> bool:
+        return cls.FILL_PATTERN.fullmatch(pattern) is not None
+
+    def match(self, pattern: str,
+              len_min: int | None = None,
+              len_max: int | None = None) -> list[str]:
+        """Return every word matching a fill pattern, where . is any letter."""
+        length = len(pattern)
+
+        # The pattern fixes the length, so the length filter either keeps or
+        # prunes the only bucket.
+        if len_min and length < len_min:
+            return []
+
+        if len_max and length > len_max:
+            return []
+
+        words = self.buckets.get(length)
+        if not words:
+            return []
+
+        bitsets = self._bitsets(length)
+
+        result = (1 << len(words)) - 1
+        for position, letter in enumerate(pattern):
+            if letter == '.':
+                continue
+
+            result &= bitsets[position].get(letter, 0)
+            if not result:
+                return []
+
+        # Bit string with bit 0 first
+        bits = bin(result)[:1:-1]
+        return [words[m.start()] for m in re.finditer('1', bits)]
+
+    def _bitsets(self, length: int) -> list[dict[str, int]]:
+        if length in self.bitsets:
+            return self.bitsets[length]
+
+        bitsets = letter_bitsets(self.buckets[length], length)
+        self.bitsets[length] = bitsets
+        return bitsets
+
+
+def letter_bitsets(words: list[str], length: int) -> list[dict[str, int]]:
+    """Return, per position, { letter: bitset } over words of length, where
+    bit i is set if the i-th word has that letter at that position."""
+    num_bytes = (len(words) + 7) // 8
+
+    # Bits are set in bytearrays, then turned into ints once, since setting
+    # bits of a big int one at a time copies it every time.
+    bytesets: list[dict[str, bytearray]] = [{} for _ in range(length)]
+    for i, word in enumerate(words):
+        byte, bit = i >> 3, 1 << (i & 7)
+        for position, letter in enumerate(word):
+            byteset = bytesets[position].get(letter)
+            if byteset is None:
+                byteset = bytearray(num_bytes)
+                bytesets[position][letter] = byteset
+
+            byteset[byte] |= bit
+
+    return [{letter: int.from_bytes(byteset, 'little')
+             for letter, byteset in position.items()}
+            for position in bytesets]
@@ -0,0 +1,122 @@
+import sys
+
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+
+# (score_minimum, score_maximum, len_min, len_max), with None for no limit
+Filters = tuple[int, int | None, int | None, int | None]
+
+
+def filter_fn(filters: Filters) -> Callable[[str, int], bool]:
+    """Return whether a word and its score pass filters. Every search
+    filters through this, so they all agree on what the limits mean."""
+    score_minimum, score_maximum, len_min, len_max = filters
+
+    # None or 0 means no limit; turn those into bounds that can't be hit, so
+    # the check is just two chained comparisons.
+    score_maximum = score_maximum or sys.maxsize
+    len_min = len_min or 0
+    len_max = len_max or sys.maxsize
+
+    def passes(word: str, score: int) -> bool:
+        return (score_minimum <= score <= score_maximum and
+                len_min <= len(word) <= len_max)
+
+    return passes
+
+
+class QueryCache():
+    """Bounded LRU cache of search results.
+
+    Results are keyed by query (e.g. ('regex', pattern)) and remember the
+    filters they were computed with. A lookup with tighter filters is
+    answered from a cached looser result, so re-running a search with a
+    higher score minimum or narrower lengths doesn't rescan.
+
+    Size is bounded by the total number of cached words as well as the
+    number of entries, so a few huge results can't pin lots of memory.
+    """
+
+    # Rough cost of one cached word: the tuple, plus list/dict slot
+    BYTES_PER_WORD = 80
+
+    def __init__(self, max_words: int = 500_000, max_entries: int = 256
+                 ) -> None:
+        self.max_words = max_words
+        self.max_entries = max_entries
+
+        # self.entries is an OrderedDict { key: (filters, value, size) },
+        # least recently used first
+        self.entries: OrderedDict[tuple[str, str],
+                                  tuple[Filters, Any, int]] = OrderedDict()
+        self.words = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def filters(score_minimum: int,
+                score_maximum: int | None = None,
+                len_min: int | None = None,
+                len_max: int | None = None) -> Filters:
+        """Normalize filters, since 0 and None both mean no limit."""
+        return (score_minimum, score_maximum or None, len_min or None,
+                len_max or None)
+
+    @staticmethod
+    def covers(cached: Filters, wanted: Filters) -> bool:
+        """Return whether results for cached filters include every result
+        for wanted filters."""
+        (c_score_min, c_score_max, c_len_min, c_len_max) = cached
+        (score_min, score_max, len_min, len_max) = wanted
+
+        return (c_score_min <= score_min
+                and (c_score_max is None or
+                     (score_max is not None and score_max <= c_score_max))
+                and (c_len_min is None or
+                     (len_min is not None and len_min >= c_len_min))
+                and (c_len_max is None or
+                     (len_max is not None and len_max <= c_len_max)))
+
+    def get(self, key: tuple[str, str], filters: Filters) -> Any | None:
+        """Return the cached value for key, if it covers filters. The caller
+        still has to apply filters to it."""
+        entry = self.entries.get(key)
+        if entry is None or not self.covers(entry[0], filters):
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple[str, str], filters: Filters, value: Any,
+            size: int) -> None:
+        if size > self.max_words:
+            return
+
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.words -= old[2]
+
+        self.entries[key] = (filters, value, size)
+        self.words += size
+
+        while self.words > self.max_words or \
+                len(self.entries) > self.max_entries:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.words -= evicted_size
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.words = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'words': self.words,
+            'approx_bytes': self.words * self.BYTES_PER_WORD,
+        }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# Long-running query server holding one loaded Wordlist and its indexes.
+#
+# Tools connect over a Unix socket (see client.py) instead of each loading
+# the lists themselves. The protocol is one JSON object per line each way:
+#
+#   -> {"method": "search_regex", "args": ["c.t.r"], "kwargs": {}}
+#   <- {"result": {"cater": 50}}   or   {"error": "..."}
+#
+# A request can also set "budget", a time limit in seconds.
+#
+#   ./server.py ~/wordlists &
+#   python -c 'import client; print(client.Client().score("cater"))'
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+import util
+from client import default_socket_path
+from stats import recorder
+from wordlist import Wordlist
+
+
+# Methods clients may call, with how to run each against the wordlist.
+# Results must be JSON serializable; client.py restores the tuples.
+METHODS: dict[str, Callable[..., Any]] = {
+    'match_exact': lambda wl, word: wl.match_exact(util.normalize(word)),
+    'score': lambda wl, word, score_minimum=0: wl.score(
+        util.normalize(word), score_minimum),
+    'contains': lambda wl, word, score_minimum=0: wl.contains(
+        util.normalize(word), score_minimum),
+    'search_regex': Wordlist.search_regex,
+    'search_substring': Wordlist.search_substring,
+    'search_sandwich': Wordlist.search_sandwich,
+    'search_anagram': Wordlist.search_anagram,
+    'search_letter_bank': Wordlist.search_letter_bank,
+    'search_neighbors': Wordlist.search_neighbors,
+    'stats': lambda wl: {'stages': recorder.dump(),
+                         'lists': wl.memory_usage()},
+}
+
+
+class WordlistServer():
+    """Answers queries from any number of connections.
+
+    The event loop only does I/O. Queries run one at a time on a single
+    worker thread, since Wordlist (its query cache, lazy indexes, reloads)
+    isn't thread safe, and the GIL would serialize them anyway."""
+
+    def __init__(self, wordlist: Wordlist, auto_reload: bool = True) -> None:
+        self.wordlist = wordlist
+        self.auto_reload = auto_reload
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def call(self, request: dict[str, Any]) -> Any:
+        method = METHODS.get(request.get('method', ''))
+        if method is None:
+            raise ValueError(f"unknown method: {request.get('method')}")
+
+        # Same as the REPL: pick up edited lists before answering.
+        if self.auto_reload:
+            changed = self.wordlist.reload()
+            if changed:
+                print(f"reloaded {', '.join(changed)}", file=sys.stderr)
+
+        with recorder.timed('search'), \
+                self.wordlist.time_budget(request.get('budget')):
+            return method(self.wordlist, *request.get('args', []),
+                          **request.get('kwargs', {}))
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    result = await loop.run_in_executor(self.executor,
+                                                        self.call, request)
+                    response = {'result': result}
+                except Exception as e:
+                    # Bad requests (and bad regexes) only fail themselves.
+                    response = {'error': f"{type(e).__name__}: {e}"}
+
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path: Path) -> None:
+        # A socket file left behind by a server that died
+        if path.exists():
+            path.unlink()
+
+        server = await asyncio.start_unix_server(self.handle, path=str(path),
+                                                 limit=1 << 24)
+        os.chmod(path, 0o600)
+        print(f"listening on {path}", file=sys.stderr)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+
+def main(args: argparse.Namespace) -> None:
+    wl = Wordlist()
+    if args.columnar:
+        from columnar import ColumnarWordlist
+        wl = ColumnarWordlist()
+
+    wl.load(args.files, jobs=args.jobs)
+
+    # Forking scan workers from a process running an event loop and a worker
+    # thread can deadlock, so unindexed regexes are scanned in process.
+    wl.scan_jobs = 1
+
+    # Build the common indexes up front, so the first queries are fast too.
+    wl.positional_index()
+    wl.trigram_index()
+    wl.suffix_array()
+    wl.affix_index()
+
+    server = WordlistServer(wl, auto_reload=not args.no_reload)
+    try:
+        asyncio.run(server.serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('files', nargs='+',
+                        help='wordlist files or directories to load')
+    parser.add_argument('-s', '--socket', type=Path,
+                        default=default_socket_path(),
+                        help='Unix socket to listen on')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes to parse wordlists with')
+    parser.add_argument('--columnar', action='store_true',
+                        help='use the NumPy columnar backend (needs numpy)')
+    parser.add_argument('--no-reload', action='store_true',
+                        help="don't check for changed wordlists before "
+                        "each query")
+
+    main(parser.parse_args())
@@ -0,0 +1,171 @@
+import atexit
+import itertools
+import re
+import signal
+
+from array import array
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+from typing import Iterator
+
+from querycache import Filters
+from querycache import filter_fn
+
+
+class ScanSnapshot():
+    """The merged index (words and effective scores, in order) in shared
+    memory, so scan workers can read it without it being pickled to them.
+
+    Layout:
+      scores   int16 per word
+      offsets  uint32 per word, plus one, into the blob (4-byte aligned)
+      blob     utf-8 words, each followed by a NUL
+    """
+
+    def __init__(self, scores: dict[str, int]) -> None:
+        self.count = len(scores)
+
+        # The words again, by index, for the scanning process to map results
+        # back with. Not shared.
+        self.words = list(scores)
+
+        encoded = [word.encode() + b'\0' for word in scores]
+        offsets = array('I', itertools.accumulate(map(len, encoded),
+                                                  initial=0))
+        score_array = array('h', scores.values())
+
+        self.offsets_start = _aligned(len(score_array) * 2)
+        self.blob_start = self.offsets_start + len(offsets) * 4
+        size = self.blob_start + offsets[-1]
+
+        shm = SharedMemory(create=True, size=max(size, 1))
+        buf = shm.buf
+        assert buf is not None
+        buf[:len(score_array) * 2] = score_array.tobytes()
+        buf[self.offsets_start:self.blob_start] = offsets.tobytes()
+        buf[self.blob_start:size] = b''.join(encoded)
+
+        self.shm: SharedMemory | None = shm
+
+        atexit.register(self.close)
+
+    @property
+    def name(self) -> str:
+        assert self.shm is not None, 'snapshot is closed'
+        return self.shm.name
+
+    def close(self) -> None:
+        if self.shm is None:
+            return
+
+        atexit.unregister(self.close)
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def scan(self, regex: str, filters: Filters, jobs: int,
+             check: Callable[[], None]) -> Iterator[int]:
+        """Yield the index of every word that passes filters and fully
+        matches regex, in order, scanning shards in jobs worker processes.
+
+        check is called while waiting on workers (e.g. to enforce a time
+        budget); if it or Ctrl-C raises, unstarted shards are cancelled."""
+        pool = _get_pool(jobs)
+
+        # More shards than workers, so workers finishing at different times
+        # even out, and cancelling doesn't wait on a huge shard.
+        shards = jobs * 4
+        step = -(-self.count // shards)
+        futures: list[Future[list[int]]] = [
+            pool.submit(scan_shard, self.name, self.count, self.offsets_start,
+                        self.blob_start, regex, filters, lo,
+                        min(lo + step, self.count))
+            for lo in range(0, self.count, step)]
+
+        try:
+            for future in futures:
+                while True:
+                    try:
+                        ids = future.result(timeout=0.05)
+                        break
+                    except TimeoutError:
+                        check()
+
+                yield from ids
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _aligned(n: int) -> int:
+    return (n + 3) & ~3
+
+# WORKERS #
+###########
+_pool: ProcessPoolExecutor | None = None
+_pool_jobs = 0
+
+def _get_pool(jobs: int) -> ProcessPoolExecutor:
+    """One long-lived pool, since starting workers costs more than most
+    scans."""
+    global _pool, _pool_jobs
+    if _pool is None or _pool_jobs != jobs:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+
+        # Forked, since spawning would re-run the caller's script in every
+        # worker. Workers only read the snapshot, so they never touch (and
+        # copy) the rest of the inherited heap.
+        _pool = ProcessPoolExecutor(max_workers=jobs,
+                                    mp_context=get_context('fork'),
+                                    initializer=_init_worker)
+        _pool_jobs = jobs
+        atexit.register(_pool.shutdown, cancel_futures=True)
+
+    return _pool
+
+def _init_worker() -> None:
+    # ^C is for the parent, which cancels the scan; workers just finish
+    # their shard.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# The snapshot this worker is attached to
+_attached: SharedMemory | None = None
+
+def _attach(name: str) -> SharedMemory:
+    global _attached
+    if _attached is None or _attached.name != name:
+        if _attached is not None:
+            _attached.close()
+
+        # Workers share the parent's resource tracker, so this doesn't give
+        # them a say in when the snapshot is unlinked.
+        _attached = SharedMemory(name=name)
+
+    return _attached
+
+def scan_shard(name: str, count: int, offsets_start: int, blob_start: int,
+               regex: str, filters: Filters, lo: int, hi: int) -> list[int]:
+    """Return the indexes in [lo, hi) of words passing filters and regex."""
+    buf = _attach(name).buf
+    assert buf is not None, 'snapshot is closed'
+    scores = buf[:count * 2].cast('h')
+    offsets = buf[offsets_start:blob_start].cast('I')
+
+    # Decode the shard's words in one go; drop the last word's NUL.
+    blob = bytes(buf[blob_start + offsets[lo]:blob_start + offsets[hi] - 1])
+    words = blob.decode().split('\0')
+
+    passes = filter_fn(filters)
+    match = re.compile(regex).fullmatch
+
+    results = [i for i, word in enumerate(words, lo)
+               if passes(word, scores[i]) and match(word)]
+
+    scores.release()
+    offsets.release()
+    return results
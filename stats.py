@@ -0,0 +1,110 @@
+import time
+
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+
+# Stages, in the order they're reported
+STAGES = ['load', 'index', 'parse', 'search', 'render']
+
+
+class StageStats():
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+
+        # Words the search looked at, and words it returned. Searches that
+        # don't know how many words they looked at leave scanned alone.
+        self.scanned = 0
+        self.matched = 0
+
+    def dump(self) -> dict[str, Any]:
+        return {'calls': self.calls, 'seconds': self.seconds,
+                'scanned': self.scanned, 'matched': self.matched}
+
+    def merge(self, dump: dict[str, Any]) -> None:
+        self.calls += dump['calls']
+        self.seconds += dump['seconds']
+        self.scanned += dump['scanned']
+        self.matched += dump['matched']
+
+
+class Recorder():
+    """Wall time, and words scanned and matched, per stage.
+
+    Keeps totals since the last reset, and separately what happened since
+    the last take(), i.e. during the current command or query. Stages can
+    nest: search time includes the parse time of its regex.
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[str, StageStats] = {}
+        self.current: dict[str, StageStats] = {}
+
+    def reset(self) -> None:
+        self.totals = {}
+        self.current = {}
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        for stats in self._stats(stage):
+            stats.calls += calls
+            stats.seconds += seconds
+
+    def count(self, stage: str, matched: int, scanned: int = 0) -> None:
+        for stats in self._stats(stage):
+            stats.matched += matched
+            stats.scanned += scanned
+
+    def take(self) -> dict[str, Any]:
+        """Return (as a dump) and clear what happened since the last take."""
+        current = self.current
+        self.current = {}
+        return self._dump(current)
+
+    def dump(self) -> dict[str, Any]:
+        """Totals as plain data, e.g. for JSON."""
+        return self._dump(self.totals)
+
+    def merge(self, dump: dict[str, Any]) -> None:
+        """Add a dump (e.g. from another process) into the totals."""
+        for stage, stage_dump in dump.items():
+            self.totals.setdefault(stage, StageStats()).merge(stage_dump)
+
+    def _stats(self, stage: str) -> tuple[StageStats, StageStats]:
+        return (self.totals.setdefault(stage, StageStats()),
+                self.current.setdefault(stage, StageStats()))
+
+    @staticmethod
+    def _dump(stages: dict[str, StageStats]) -> dict[str, Any]:
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return {stage: stages[stage].dump()
+                for stage in sorted(stages,
+                                    key=lambda s: (order.get(s, len(order)),
+                                                   s))}
+
+def footer(dump: dict[str, Any]) -> str:
+    """One line summary of a take(), e.g. for after each command."""
+    parts = []
+    for stage, stats in dump.items():
+        part = f"{stage} {stats['seconds'] * 1000:.1f} ms"
+        if stats['scanned']:
+            part += f" ({stats['scanned']} scanned, {stats['matched']} " \
+                    "matched)"
+        elif stats['matched']:
+            part += f" ({stats['matched']} matched)"
+
+        parts.append(part)
+
+    return ', '.join(parts)
+
+# Shared by everything in the process, since rendering and regex parsing
+# happen in util, away from any Wordlist.
+recorder = Recorder()
@@ -0,0 +1,105 @@
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Iterable
+from typing import Iterator
+
+
+class SuffixArray():
+    """Suffix array over the concatenation of a word table.
+
+    All words are joined into one string, separated by NUL. Every suffix
+    position is sorted by its text up to the next separator, so the suffixes
+    starting with a substring form one contiguous range that can be found
+    with two binary searches: O(m log n) to find it, O(k) to read it.
+
+    Words added later (see add) aren't sorted in. They're kept after the
+    indexed words and scanned linearly, which is cheap for the handful a
+    reload or score edit brings in.
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words: list[str] = list(words)
+        self.text = self.SEPARATOR.join(self.words) + self.SEPARATOR
+
+        # Words with ids from here on are added ones, not in self.suffixes
+        self.indexed = len(self.words)
+
+        # self.owner maps a text position to its word id
+        self.owner = array('I')
+        for i, word in enumerate(self.words):
+            self.owner.extend([i] * (len(word) + 1))
+
+        # Sort one first-letter bucket at a time, to keep the sort keys for
+        # all suffixes from being in memory at once.
+        text = self.text
+        buckets: defaultdict[str, array] = defaultdict(lambda: array('I'))
+        for i, char in enumerate(text):
+            if char != self.SEPARATOR:
+                buckets[char].append(i)
+
+        def suffix(i: int) -> str:
+            return text[i:text.find(self.SEPARATOR, i)]
+
+        self.suffixes = array('I')
+        for char in sorted(buckets):
+            self.suffixes.extend(sorted(buckets[char], key=suffix))
+
+    def add(self, words: Iterable[str]) -> None:
+        self.words.extend(words)
+
+    def _range(self, substring: str) -> tuple[int, int]:
+        """Return the range of suffixes starting with substring."""
+        m = len(substring)
+        text = self.text
+
+        def key(i: int) -> str:
+            return text[i:i + m]
+
+        lo = bisect_left(self.suffixes, substring, key=key)
+        hi = bisect_right(self.suffixes, substring, lo=lo, key=key)
+        return lo, hi
+
+    def ids(self, substring: str) -> set[int]:
+        """Return the ids of every word containing substring."""
+        if not substring:
+            return set(range(len(self.words)))
+
+        lo, hi = self._range(substring)
+        owner = self.owner
+        ids = {owner[i] for i in self.suffixes[lo:hi]}
+
+        words = self.words
+        ids.update(i for i in range(self.indexed, len(words))
+                   if substring in words[i])
+        return ids
+
+    def iter_ids(self, substring: str) -> Iterator[int]:
+        """Yield the id of every word containing substring, once each and in
+        no particular order, without collecting them (e.g. for counting)."""
+        if not substring:
+            yield from range(len(self.words))
+            return
+
+        # A byte per word marks the ones already yielded, since a word can
+        # contain substring more than once.
+        lo, hi = self._range(substring)
+        owner = self.owner
+        seen = bytearray(len(self.words))
+        for i in self.suffixes[lo:hi]:
+            word_id = owner[i]
+            if not seen[word_id]:
+                seen[word_id] = 1
+                yield word_id
+
+        words = self.words
+        yield from (i for i in range(self.indexed, len(words))
+                    if substring in words[i])
+
+    def find(self, substring: str) -> list[str]:
+        """Return every word containing substring."""
+        words = self.words
+        return [words[i] for i in sorted(self.ids(substring))]
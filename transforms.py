@@ -0,0 +1,117 @@
+from abc import ABC
+from abc import abstractmethod
+from typing import Iterable
+from typing import Iterator
+
+# Word transforms for wordplay searches (see Wordlist.search_transform).
+#
+# A transform maps a word to a new word, or None if it doesn't apply. Each one
+# can also name a substring or prefix that any word it applies to must
+# contain, so the search only has to visit those words (found with the suffix
+# array or affix index) instead of the whole word table.
+
+
+class Transform(ABC):
+    # Every word the transform applies to contains this substring...
+    substring: str | None = None
+    # ... or starts with this prefix.
+    prefix: str | None = None
+
+    @abstractmethod
+    def __call__(self, word: str) -> str | None:
+        pass
+
+    def apply_all(self, words: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Yield (word, transformed) for each word the transform applies
+        to."""
+        for word in words:
+            new_word = self(word)
+            if new_word:
+                yield word, new_word
+
+
+class CharMap(Transform):
+    """Map every letter through a table, e.g. upside down letters. Words with
+    letters missing from the table are skipped."""
+
+    def __init__(self, mapping: dict[str, str], reverse: bool = False) -> None:
+        self.table = str.maketrans(mapping)
+        # Deletes every mappable letter; anything left over isn't mappable.
+        self.unmapped = str.maketrans('', '', ''.join(mapping))
+        self.reverse = reverse
+
+    def __call__(self, word: str) -> str | None:
+        if word.translate(self.unmapped):
+            return None
+
+        new_word = word.translate(self.table)
+        return new_word[::-1] if self.reverse else new_word
+
+
+class Replace(Transform):
+    """Replace every occurrence of a substring, e.g. b -> d."""
+
+    def __init__(self, old: str, new: str) -> None:
+        self.old = old
+        self.new = new
+        self.substring = old
+
+    def __call__(self, word: str) -> str | None:
+        if self.old not in word:
+            return None
+
+        return word.replace(self.old, self.new)
+
+
+class Strip(Replace):
+    """Remove a substring from inside a word, e.g. (air) in fairy -> fy.
+    With inner_only, the substring can't be at either end."""
+
+    def __init__(self, substring: str, inner_only: bool = True) -> None:
+        super().__init__(substring, '')
+        self.inner_only = inner_only
+
+    def __call__(self, word: str) -> str | None:
+        if self.inner_only and self.old not in word[1:-1]:
+            return None
+
+        return super().__call__(word)
+
+
+class Reverse(Transform):
+    def __call__(self, word: str) -> str | None:
+        return word[::-1]
+
+
+class SwapPrefix(Transform):
+    """Swap one prefix for another, e.g. hot(dog) -> sour(dog)."""
+
+    def __init__(self, old: str, new: str) -> None:
+        self.old = old
+        self.new = new
+        self.prefix = old
+
+    def __call__(self, word: str) -> str | None:
+        if not word.startswith(self.old):
+            return None
+
+        return self.new + word[len(self.old):]
+
+
+# Letters that read as letters when turned upside down
+UPSIDE_DOWN = {
+    's': 's',
+    'i': 'i',
+    'o': 'o',
+    'n': 'n',
+    'x': 'x',
+    'z': 'z',
+    'h': 'h',
+
+    'm': 'w',
+    'w': 'm',
+}
+
+
+def upside_down() -> Transform:
+    return CharMap(UPSIDE_DOWN, reverse=True)
@@ -0,0 +1,119 @@
+import re
+
+from array import array
+from typing import Any
+from typing import Iterable
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:
+    import sre_parse  # type: ignore[no-redef]
+
+
+class TrigramIndex():
+    """Inverted index from every trigram to the words containing it.
+
+    Used as a prefilter for regexes: a word can only match if it contains
+    every trigram of the pattern's required literals, so only those
+    candidates need to go through fullmatch.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words: list[str] = []
+
+        # self.postings is a dict { trigram: [word id] }, ids ascending
+        self.postings: dict[str, array] = {}
+
+        self.add(words)
+
+    def add(self, words: Iterable[str]) -> None:
+        for word in words:
+            i = len(self.words)
+            self.words.append(word)
+
+            for trigram in {word[j:j + 3] for j in range(len(word) - 2)}:
+                posting = self.postings.get(trigram)
+                if posting is None:
+                    posting = array('I')
+                    self.postings[trigram] = posting
+
+                posting.append(i)
+
+    def candidates(self, regex: str) -> list[str] | None:
+        """Return the words that could match regex, or None if the regex has
+        no literals long enough to narrow the search."""
+        trigrams: set[str] = set()
+        for literal in required_literals(regex):
+            trigrams.update(literal[j:j + 3] for j in range(len(literal) - 2))
+
+        if not trigrams:
+            return None
+
+        postings = []
+        for trigram in trigrams:
+            posting = self.postings.get(trigram)
+            if posting is None:
+                return []
+            postings.append(posting)
+
+        # Intersect starting from the rarest trigram
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids.intersection_update(posting)
+            if not ids:
+                return []
+
+        return [self.words[i] for i in sorted(ids)]
+
+
+# Regex analysis #
+##################
+
+def required_literals(regex: str) -> list[str]:
+    """Return literal fragments that every match of regex must contain.
+
+    Only literal runs that are certain to appear are returned: anything under
+    an alternation or an optional repeat is skipped. Returns an empty list if
+    nothing is certain, or the regex can't be parsed."""
+    try:
+        parsed = sre_parse.parse(regex)
+    except re.error:
+        return []
+
+    if parsed.state.flags & re.IGNORECASE:
+        return []
+
+    literals: list[str] = []
+    _collect_literals(parsed, literals)
+
+    return literals
+
+def _collect_literals(pattern: Any, literals: list[str]) -> None:
+    run: list[str] = []
+
+    for op, av in pattern:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+
+        if run:
+            literals.append(''.join(run))
+            run = []
+
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, _, subpattern = av
+            if not add_flags & re.IGNORECASE:
+                _collect_literals(subpattern, literals)
+
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+                    getattr(sre_parse, 'POSSESSIVE_REPEAT', None)):
+            repeat_min, _, subpattern = av
+            if repeat_min >= 1:
+                _collect_literals(subpattern, literals)
+
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            _collect_literals(av, literals)
+
+    if run:
+        literals.append(''.join(run))
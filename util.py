@@ -1,9 +1,21 @@
 from typing import Any
+import contextlib
+import functools
+import io
+import os
 import re
+import shutil
+import subprocess
+import sys
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+from stats import recorder
 
 def regex_match_bool(regex_str: str) -> Callable[[str], bool]:
-    compiled_regex = re.compile(regex_str)
+    with recorder.timed('parse'):
+        compiled_regex = re.compile(regex_str)
 
     return lambda s: compiled_regex.fullmatch(s) is not None
 
@@ -63,20 +75,115 @@ def tableize(highlight_word: str | list | None, matches: list[str],
     elif isinstance(highlight_word, list):
         to_highlight = highlight_word
 
-    columns = split_array(matches, num_columns)
-
-    wordlengths = [[len(x) for x in col] for col in columns]
-    col_lengths = [max(x) + 2 for x in wordlengths if len(x) > 0]
-
-    # Pad to column len & color original word
-    def tablefmt(word: str, col_len: int) -> str:
-        padded_word = str.ljust(word, col_len)
-        return Color.highlight_many(padded_word, to_highlight, Color.YELLOW)
+    with recorder.timed('render'):
+        columns = split_array(matches, num_columns)
+
+        wordlengths = [[len(x) for x in col] for col in columns]
+        col_lengths = [max(x) + 2 for x in wordlengths if len(x) > 0]
+
+        # Pad to column len
+        lines = []
+        for i in range(len(columns[0])):
+            row_words = [col[i] for col in columns if len(col) > i]
+            lines.append(''.join([w.ljust(l)
+                                  for (w, l) in zip(row_words, col_lengths)]))
+
+        # Color the whole table in one pass, after padding (escape codes take
+        # no space on screen), then write it at once.
+        highlight = Color.highlighter(to_highlight, Color.YELLOW)
+        sys.stdout.write(highlight('\n'.join(lines) + '\n'))
+
+# Terminal size, with a default when output isn't a terminal.
+def terminal_size() -> os.terminal_size:
+    return shutil.get_terminal_size()
+
+# Page output of the block that gets taller than the terminal (see Pager).
+@contextlib.contextmanager
+def paged(enabled: bool = True) -> Iterator[None]:
+    stdout = sys.stdout
+    if not enabled or not stdout.isatty():
+        yield
+        return
 
-    for i in range(len(columns[0])):
-        row_words = [col[i] for col in columns if len(col) > i]
-        row = [tablefmt(w, l) for (w, l) in zip(row_words, col_lengths)]
-        print(''.join(row))
+    output = Pager(stdout)
+    try:
+        with contextlib.redirect_stdout(output):
+            yield
+    finally:
+        output.close()
+
+# Stdout for one command. Output is written straight through, so streamed
+# results show up as they're found, until it's taller than the terminal.
+# Then it's shown again from the top in a pager, which is sent the rest as
+# it's written.
+class Pager(io.TextIOBase):
+    def __init__(self, stdout: Any) -> None:
+        self.stdout = stdout
+        self.written: list[str] = []
+
+        # Leave a line for the prompt
+        self.lines_left = terminal_size().lines - 1
+
+        self.pager: subprocess.Popen[str] | None = None
+
+        # Set once the pager is quit; the rest of the output is dropped.
+        self.closed_early = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if self.pager is not None:
+            self._write_pager(s)
+            return len(s)
+
+        self.written.append(s)
+        self.lines_left -= s.count('\n')
+        if self.lines_left >= 0 or not self._start_pager():
+            self.stdout.write(s)
+
+        return len(s)
+
+    def flush(self) -> None:
+        if self.pager is None:
+            self.stdout.flush()
+
+    def close(self) -> None:
+        if self.pager is None:
+            self.stdout.flush()
+            return
+
+        try:
+            assert self.pager.stdin is not None
+            self.pager.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        self.pager.wait()
+        self.pager = None
+
+    def _start_pager(self) -> bool:
+        # -R keeps colors
+        command = os.environ.get('PAGER', 'less -R')
+        try:
+            self.pager = subprocess.Popen(command, shell=True, text=True,
+                                          stdin=subprocess.PIPE, bufsize=1)
+        except OSError:
+            return False
+
+        self._write_pager(''.join(self.written))
+        self.written = []
+        return True
+
+    def _write_pager(self, s: str) -> None:
+        if self.closed_early:
+            return
+
+        try:
+            assert self.pager is not None and self.pager.stdin is not None
+            self.pager.stdin.write(s)
+        except BrokenPipeError:
+            self.closed_early = True
 
 # Helper class containing color constants and some colorizing functions
 class Color:
@@ -110,7 +217,7 @@ class Color:
 
     @staticmethod
     def highlight(full: str, substr: str, *args: int) -> str:
-        if substr not in full:
+        if not substr or substr not in full:
             return full
 
         index = full.find(substr)
@@ -123,13 +230,14 @@ class Color:
 
     @staticmethod
     def highlight_many(full: str, substrs: list[str], *args: int) -> str:
-        # This is currently like O(n^2 * m)
-        word = full
-
-        for substr in substrs:
-            word = Color.highlight(word, substr, *args)
+        return Color.highlighter(substrs, *args)(full)
 
-        return word
+    # Returns a function highlighting every occurrence of substrs in a
+    # string, in a single pass.
+    @staticmethod
+    def highlighter(substrs: Iterable[str], *args: int
+                    ) -> Callable[[str], str]:
+        return _highlighter(tuple(substrs), args)
 
     @staticmethod
     def bold(s: str) -> str:
@@ -150,3 +258,22 @@ class Color:
     @staticmethod
     def grey(s: str) -> str:
         return Color.fmt(s, Color.GREY)
+
+WHITESPACE = re.compile(r'\s')
+
+@functools.lru_cache(maxsize=64)
+def _highlighter(substrs: tuple[str, ...], args: tuple[int, ...]
+                 ) -> Callable[[str], str]:
+    # Empty strings would match everywhere (and print bare escape codes).
+    # Words have no whitespace, so terms with it never match one, only the
+    # padding between them.
+    terms = sorted({s for s in substrs if s and not WHITESPACE.search(s)},
+                   key=len, reverse=True)
+    if not terms or not args:
+        return lambda s: s
+
+    # Longest first, so a term isn't cut short by one of its prefixes.
+    pattern = re.compile('|'.join(map(re.escape, terms)))
+    colored = {term: Color.fmt(term, *args) for term in terms}
+
+    return functools.partial(pattern.sub, lambda m: colored[m.group()])
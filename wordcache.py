@@ -0,0 +1,109 @@
+import mmap
+import os
+import struct
+
+from array import array
+from pathlib import Path
+
+# Compiled wordlist cache.
+#
+# Parsing a text wordlist (strip, split, normalize, int) is slow for the big
+# lists, so the parsed result is written next to the source file as
+# .<name>.wlc, and reused for as long as the source's path, size and mtime
+# match.
+#
+# Layout (little endian):
+#   header   MAGIC, VERSION, source size, source mtime_ns, word count,
+#            blob length, errors length, path length
+#   path     utf-8 source path, padded to a multiple of 4
+#   scores   int16 per word, as in ScoreList
+#   blob     utf-8 normalized words joined by newlines
+#   errors   utf-8 invalid line diagnostics joined by newlines
+#
+# Loading returns the words and scores as two columns, which
+# ScoreList.from_columns takes as they are, instead of going through a dict.
+
+MAGIC = b'WLC1'
+VERSION = 3
+HEADER = struct.Struct('<4sIQqIQQH')
+
+def cache_path(path: Path) -> Path:
+    return path.parent / f'.{path.name}.wlc'
+
+def _source_key(path: Path) -> tuple[bytes, int, int]:
+    stat = path.stat()
+    return str(path.resolve()).encode(), stat.st_size, stat.st_mtime_ns
+
+def _padded(n: int) -> int:
+    return (n + 3) & ~3
+
+def read_cache(path: Path) -> tuple[list[str], array, list[str]] | None:
+    """Return the cached (words, scores, errors) for path, or None if
+    there's no cache or it's stale."""
+    try:
+        source, size, mtime_ns = _source_key(path)
+        with open(cache_path(path), 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    with mm:
+        if len(mm) < HEADER.size:
+            return None
+
+        (magic, version, cached_size, cached_mtime_ns, count, blob_len,
+         errors_len, path_len) = HEADER.unpack_from(mm)
+
+        if magic != MAGIC or version != VERSION:
+            return None
+
+        offset = HEADER.size
+        cached_source = mm[offset:offset + path_len]
+        if (cached_source, cached_size, cached_mtime_ns) != \
+                (source, size, mtime_ns):
+            return None
+
+        offset += _padded(path_len)
+        scores = array('h')
+        scores.frombytes(mm[offset:offset + 2 * count])
+
+        offset += 2 * count
+        blob = mm[offset:offset + blob_len].decode()
+        offset += blob_len
+        errors = mm[offset:offset + errors_len].decode()
+
+    words = blob.split('\n') if count else []
+    return words, scores, errors.split('\n') if errors else []
+
+def write_cache(path: Path, words: list[str], scores: array,
+                errors: list[str]) -> None:
+    """Write the cache for path. Failures (e.g. a read-only directory) are
+    ignored, since the cache is only an optimization."""
+    try:
+        source, size, mtime_ns = _source_key(path)
+    except OSError:
+        return
+
+    blob = '\n'.join(words).encode()
+    errors_blob = '\n'.join(errors).encode()
+
+    header = HEADER.pack(MAGIC, VERSION, size, mtime_ns, len(words),
+                         len(blob), len(errors_blob), len(source))
+
+    target = cache_path(path)
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(source.ljust(_padded(len(source)), b'\x00'))
+            f.write(scores.tobytes())
+            f.write(blob)
+            f.write(errors_blob)
+
+        # Atomic, so concurrent readers never see a partial file
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
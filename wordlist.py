@@ -1,15 +1,49 @@
 import re
 import os
+import itertools
+import contextlib
 
 import sys
+from array import array
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import Levenshtein
 
 import util
+import wordcache
 from util import Color
+from positional import PositionalIndex
+from trigram import TrigramIndex
+from suffixarray import SuffixArray
+from affix import AffixIndex
+from budget import Budget
+from budget import BudgetExceeded
+from transforms import Transform
+from anagram import AnagramIndex
+from gridfill import Fill
+from gridfill import Grid
+from gridfill import GridFiller
+from journal import ScoreJournal
+from neighbors import NeighborIndex
+from querycache import Filters
+from querycache import QueryCache
+from querycache import filter_fn
+from sharded import ScanSnapshot
+from stats import recorder
+from wordtable import FileScores
+from wordtable import ScoreList
+from wordtable import WordTable
 
 from typing import Callable
 from typing import DefaultDict
+from typing import Mapping
+from typing import TypeVar
+from typing import Iterable
+from typing import Iterator
+
+T = TypeVar('T')
 
 
 class Wordlist():
@@ -21,23 +55,80 @@ class Wordlist():
 
     def __init__(self) -> None:
         # self.data is a dict { filename: wordlist }
-        # wordlist is a dict { word: score }
-        self.data: dict[str, dict[str, int]] = {}
+        # wordlist maps { word: score }. Loaded lists are ScoreLists, which
+        # share one copy of each word through self.table.
+        self.data: dict[str, Mapping[str, int]] = {}
+        self.table = WordTable()
 
         # Wordlists are ordered, and they must be searched in this order. Later
         # lists have higher precedence.
         self.filelist: list[str] = []
 
+        # Merged view of every list in self.filelist, rebuilt whenever the set
+        # of lists changes (see _build_index).
+        # self.file_scores maps { word: per-file scores }, aligned with
+        # self.filelist, with None where a list doesn't contain the word.
+        # self.scores is a dict { word: effective score }, i.e. the score from
+        # the highest precedence list. Ignored words (score 0 in any list) are
+        # left out.
+        self.file_scores: Mapping[str, tuple[int | None, ...]] = {}
+        self.scores: dict[str, int] = {}
+
+        # Derived indexes over self.scores, built lazily on first use and
+        # dropped when the merged index is rebuilt. Reloading a list patches
+        # them instead: words that leave self.scores stay in the indexes as
+        # tombstones (every index lookup is checked against self.scores), and
+        # words that enter it are added.
+        self._tombstones: set[str] = set()
+        self._positional: PositionalIndex | None = None
+        self._trigram: TrigramIndex | None = None
+        self._suffix_array: SuffixArray | None = None
+        self._affix: AffixIndex | None = None
+        self._anagram: AnagramIndex | None = None
+        self._neighbors: NeighborIndex | None = None
+
+        # self.scores in shared memory, for regex scans split across worker
+        # processes. Built on first use, dropped whenever self.scores changes.
+        self._snapshot: ScanSnapshot | None = None
+
+        # Worker processes for regex scans no index can narrow down
+        self.scan_jobs: int = os.cpu_count() or 1
+
+        # Loaded paths, and the (path, size, mtime) each list was read from,
+        # for noticing changes on disk (see reload).
+        self.paths: list[str] = []
+        self.sources: dict[str, tuple[Path, int, int]] = {}
+
+        # Recent regex, substring and sandwich results, cleared whenever the
+        # merged index is rebuilt.
+        self.cache = QueryCache()
+
+        # Score edits made from the REPL. Its words are a pseudo-list, kept
+        # last in self.filelist so they override every loaded list.
+        self.journal: ScoreJournal | None = None
+
+        # (words scanned, total words) for the last search, to see how much
+        # the indexes are narrowing things down.
+        self.last_scan: tuple[int, int] = (0, 0)
+
+        # Deadline for the current query (see time_budget)
+        self.budget = Budget()
+
     # Loads a list of files (i.e. from command line invocation)
-    def load(self, files: str | list[str]) -> None:
-        if isinstance(files, list):
-            for file in files:
-                self.load_single_path(file)
-        else:
-            self.load_single_path(files)
+    def load(self, files: str | list[str], jobs: int = 1) -> None:
+        if not isinstance(files, list):
+            files = [files]
+
+        paths: list[Path] = []
+        for file in files:
+            paths.extend(Wordlist.wordlist_paths(file))
+            self.paths.append(file)
+
+        self.load_paths(paths, jobs)
 
         # We want to search wordlists in a specific order to handle overrides.
-        self.filelist.sort()
+        self._sort_filelist()
+        self._build_index()
 
         print('Files loaded, highest precedence last:', file=sys.stderr)
         for f in self.filelist:
@@ -48,6 +139,131 @@ class Wordlist():
     def ignore(self, filename: str) -> None:
         if filename in self.filelist:
             self.filelist.remove(filename)
+            self._build_index()
+
+    def reload(self) -> list[str]:
+        """Re-read lists that changed on disk, and pick up lists added to or
+        removed from loaded directories. Returns the names of lists that
+        changed.
+
+        Changed lists are patched into the merged index word by word. Added
+        or removed lists change every word's per-file scores, so those
+        rebuild it."""
+        current: dict[str, Path] = {}
+        for path in self.paths:
+            if Path(path).exists():
+                for file in Wordlist.wordlist_paths(path):
+                    current[file.name] = file
+
+        removed = [name for name in self.sources if name not in current]
+        added = [name for name in current if name not in self.sources]
+        changed = [name for name, file in current.items()
+                   if name in self.sources and
+                   Wordlist._stat(file) != self.sources[name][1:]]
+
+        if not (removed or added or changed):
+            return []
+
+        old_data = {name: self.data[name] for name in changed}
+
+        # Lists are read one at a time, so one that can't be read (e.g. saved
+        # halfway) only skips itself. It keeps its loaded version, and is
+        # tried again on the next reload.
+        unreadable = []
+        for name in changed + added:
+            try:
+                self.load_paths([current[name]])
+            except (OSError, ValueError) as e:
+                print(f"{current[name]}: not reloaded: {e}", file=sys.stderr)
+                unreadable.append(name)
+                continue
+
+            # load_paths appended it; a changed list keeps its original place.
+            if name in old_data:
+                self.filelist.pop()
+
+        changed = [name for name in changed if name not in unreadable]
+        added = [name for name in added if name not in unreadable]
+        if not (removed or added or changed):
+            return []
+
+        for name in removed:
+            del self.data[name]
+            del self.sources[name]
+            if name in self.filelist:
+                self.filelist.remove(name)
+
+        if removed or added:
+            self._sort_filelist()
+            self._build_index()
+        else:
+            for name in changed:
+                self._patch_index(name, old_data[name], self.data[name])
+
+        return sorted(removed + added + changed)
+
+    def attach_journal(self, path: str) -> None:
+        """Apply (and record future score edits in) the journal of the
+        wordlist at path."""
+        self.journal = ScoreJournal(Path(path))
+
+        name = self.journal.name
+        if name in self.filelist:
+            self.filelist.remove(name)
+
+        self.data[name] = self.journal.read()
+        self.filelist.append(name)
+        self._build_index()
+
+    def set_score(self, word: str, score: int) -> None:
+        """Journal a new score for word. A score of 0 ignores it."""
+        if self.journal is None:
+            raise ValueError('no score journal attached')
+
+        word = util.normalize(word)
+        self.journal.append(word, score)
+
+        edits = self.data[self.journal.name]
+        assert isinstance(edits, dict)
+
+        old = {word: edits[word]} if word in edits else {}
+        edits[word] = score
+        self._patch_index(self.journal.name, old, {word: score})
+
+    def compact_journal(self) -> int:
+        """Fold the journal into its wordlist file. Returns the number of
+        words written.
+
+        Edits to words a higher precedence list also has stay in the
+        journal, since in the list file that list would override them."""
+        if self.journal is None:
+            raise ValueError('no score journal attached')
+
+        name = self.journal.name
+        list_name = self.journal.list_path.name
+
+        later = []
+        if list_name in self.filelist:
+            later = [self.data[other] for other in
+                     self.filelist[self.filelist.index(list_name) + 1:]
+                     if other != name]
+
+        edits = self.data[name]
+        keep = {word for word in edits
+                if any(word in words for words in later)}
+
+        count = self.journal.compact(keep)
+
+        # Once the rewritten list is reloaded it carries the same scores, so
+        # the in-memory edits can go. If the list isn't loaded, they stay.
+        if list_name in self.sources:
+            self.reload()
+
+            kept = {word: edits[word] for word in keep}
+            self.data[name] = kept
+            self._patch_index(name, edits, kept)
+
+        return count
 
     # INTERFACE #
     #############
@@ -63,16 +279,31 @@ class Wordlist():
         results = self.match_exact(normalized_word)
         self.print_wordlist_matches(word, results)
 
-        # Prints entries as a table.
-        substr_results = self.search_substring(normalized_word)
-
         num_columns: int = 4
 
-        term_size: os.terminal_size = os.get_terminal_size()
+        term_size: os.terminal_size = util.terminal_size()
         max_num_results = term_size.lines * num_columns
         # Subtract 2 to account for space between columns
         max_word_length = int(term_size.columns / num_columns - 2)
 
+        # Count first, and only build the results if they can be printed.
+        with recorder.timed('search'):
+            count = self.count_substring(normalized_word, 40,
+                                         len_max=max_word_length - 1)
+            scanned = self.last_scan[0]
+
+            substr_results = {}
+            if count <= max_num_results:
+                substr_results = dict(self.iter_search_substring(
+                    normalized_word, 40, len_max=max_word_length - 1))
+
+        recorder.count('search', count, scanned)
+
+        if count > max_num_results:
+            self.print_omitted(count, word, 40)
+            return
+
+        # Prints entries as a table.
         self.print_result_table(substr_results, word, 40, num_columns,
                                 max_num_results, max_word_length)
 
@@ -85,26 +316,34 @@ class Wordlist():
                     ) -> None:
         """Regex search using Python's regex search engine, and print results to
         terminal."""
-        matches = self.search_regex(regex, score_minimum)
-        if len(matches) == 0:
-            return
+        # Length limits are applied during the search, so the matches can go
+        # straight into their length groups.
+        with recorder.timed('search'):
+            matches, complete = self.collect(
+                self.iter_search_regex(regex, score_minimum, len_min=len_min,
+                                       len_max=len_max))
 
-        highlights = self.SPLIT_ASCII_WORDS.split(regex)
-
-        print(f"Found {len(matches)} words with scores >= {score_minimum}")
-        print()
+        count = len(matches)
+        recorder.count('search', count, self.last_scan[0])
 
         words_by_length: DefaultDict[int, list[str]] = defaultdict(list)
-        for word in matches:
+        for word, _ in matches:
             words_by_length[len(word)].append(word)
 
-        for word_len in sorted(words_by_length.keys()):
-            if len_min and word_len < len_min:
-                continue
+        if not complete:
+            self.print_incomplete()
 
-            if len_max and word_len > len_max:
-                continue
+        if count == 0:
+            return
+
+        highlights = self.SPLIT_ASCII_WORDS.split(regex)
+
+        print(f"Found {count} words with scores >= {score_minimum}")
+        scanned, total = self.last_scan
+        print(Color.grey(f"(scanned {scanned} of {total} words)"))
+        print()
 
+        for word_len in sorted(words_by_length.keys()):
             words = words_by_length[word_len]
             if not words:
                 continue
@@ -120,31 +359,228 @@ class Wordlist():
             print("need at least two characters to query sandwich")
             return
 
-        # track seen words so we don't report them repeatedly
-        seen: set[str] = set()
+        # Print each split as it's found, so an interrupted search still
+        # shows everything found so far.
+        count = 0
+        try:
+            with recorder.timed('search'):
+                for prefix, suffix, matches in self.iter_search_sandwich(
+                        word, score_minimum):
+                    count += len(matches)
+                    print(prefix, '-', suffix)
+                    filtered_words = sorted(matches, key=lambda x: len(x))
+
+                    util.tableize([prefix, suffix], filtered_words)
+
+                    print()
+        except (KeyboardInterrupt, BudgetExceeded):
+            self.print_incomplete()
+
+        recorder.count('search', count)
+
+    def query_compound(self, w1: str, w2: str, score_minimum: int = 50
+                       ) -> None:
+        """Print words made by joining what follows w1 in one word with what
+        follows w2 in another, e.g. hot(dog) + sour(dough) -> dogdough."""
+        with recorder.timed('search'):
+            results = self.search_compound(w1, w2, score_minimum)
+
+        recorder.count('search', len(results))
+        if len(results) == 0:
+            print(f"no joins found for {w1} + {w2}")
+            return
 
-        for i in range(1, len(word)):
-            prefix, suffix = word[:i], word[i:]
-            regex_str = f"{prefix}.+{suffix}"
+        for w1_suffix, w2_suffix, word, score in results:
+            print(f"{score} {Color.highlight(word, w1_suffix, Color.YELLOW)} "
+                  f"({len(word)})\t"
+                  f"{Color.grey(f'// {w1} {w1_suffix} + {w2} {w2_suffix}')}")
 
-            matches = self.search_regex(regex_str, score_minimum).keys()
+    def query_transform(self, transform: Transform, score_minimum: int = 40,
+                        target_minimum: int = 0) -> None:
+        """Print words that are still words after a transform."""
+        with recorder.timed('search'):
+            results = self.search_transform(transform, score_minimum,
+                                            target_minimum)
 
-            # remove result if it contains the original word
-            filtered_words = [x for x in matches
-                              if word not in x and x not in seen]
+        recorder.count('search', len(results))
+        if len(results) == 0:
+            print("no results")
+            return
 
-            seen.update(matches)
+        results.sort(key=lambda t: (len(t[0]), t[0]))
+        for word, new_word, _, _ in results:
+            print(f"{word} - {new_word}")
 
-            if len(filtered_words) == 0:
-                continue
+    def query_anagram(self, letters: str, score_minimum: int = 40) -> None:
+        """Print anagrams of letters, and anagrams with one letter added or
+        dropped."""
+        letters = util.normalize(letters)
+        with recorder.timed('search'):
+            groups = self.search_anagram(letters, score_minimum)
+
+        recorder.count('search', sum(len(matches) for _, matches in groups))
+        if len(groups) == 0:
+            print(f"no anagrams of {letters}")
+            return
+
+        for label, matches in groups:
+            print(Color.fmt(label, Color.BOLD, Color.CYAN))
+            util.tableize(None, sorted(matches))
+            print()
+
+    def query_letter_bank(self, bank: str, score_minimum: int = 40) -> None:
+        """Print words spelled from a bank of letters, by length."""
+        bank = util.normalize(bank)
+        with recorder.timed('search'):
+            matches = self.search_letter_bank(bank, score_minimum)
+
+        recorder.count('search', len(matches))
+        if len(matches) == 0:
+            print(f"no words in {bank}")
+            return
+
+        words_by_length: DefaultDict[int, list[str]] = defaultdict(list)
+        for word in matches:
+            words_by_length[len(word)].append(word)
+
+        for word_len in sorted(words_by_length.keys()):
+            header = f"-- {str(word_len)} --"
+            print(Color.fmt(header, Color.BOLD, Color.CYAN))
 
-            print(prefix, '-', suffix)
-            filtered_words.sort(key=lambda x: len(x))
+            util.tableize(None, sorted(words_by_length[word_len]))
+            print()
 
-            util.tableize([prefix, suffix], list(filtered_words))
+    def query_neighbors(self, word: str, distance: int = 1,
+                        score_minimum: int = 40) -> None:
+        """Print words within an edit distance of word, closest first."""
+        word = util.normalize(word)
+        with recorder.timed('search'):
+            results = self.search_neighbors(word, distance, score_minimum)
+
+        recorder.count('search', len(results))
+        if len(results) == 0:
+            print(f"nothing within {distance} of {word}")
+            return
 
+        words_by_distance: DefaultDict[int, list[str]] = defaultdict(list)
+        for match, match_distance, _ in results:
+            words_by_distance[match_distance].append(match)
+
+        for match_distance in sorted(words_by_distance.keys()):
+            header = f"-- distance {match_distance} --"
+            print(Color.fmt(header, Color.BOLD, Color.CYAN))
+
+            util.tableize(None, words_by_distance[match_distance])
             print()
 
+    def query_fill(self, grid: str, score_minimum: int = 50,
+                   max_fills: int = 5, seconds: float | None = 10) -> None:
+        """Print the best fills of a grid found within seconds."""
+        parsed = Grid.parse(grid)
+        if not parsed.slots:
+            print("no slots in grid")
+            return
+
+        with recorder.timed('search'), self.time_budget(seconds):
+            fills, complete = self.collect(itertools.islice(
+                self.iter_search_fill(parsed, score_minimum), max_fills))
+
+        recorder.count('search', len(fills))
+        if not complete:
+            self.print_incomplete()
+
+        if len(fills) == 0:
+            print("no fills")
+            return
+
+        fills.sort(key=Fill.rank)
+        for rank, fill in enumerate(fills, 1):
+            print(Color.fmt(f"-- {rank} (mean score {fill.score:.0f}) --",
+                            Color.BOLD, Color.CYAN))
+            for row in fill.render():
+                print(Color.bold(' '.join(row)))
+
+            print(Color.grey('  '.join([
+                f"{name} {word} ({score})"
+                for (name, word), score in zip(fill.entries().items(),
+                                               fill.scores)])))
+            print()
+
+    def print_cache_stats(self) -> None:
+        stats = self.cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / lookups if lookups else 0
+
+        print(f"{stats['hits']} hits, {stats['misses']} misses "
+              f"({hit_rate:.0%} hit rate)")
+        print(f"{stats['entries']} cached queries, {stats['words']} words "
+              f"(~{stats['approx_bytes'] // 1024} KiB)")
+
+    def print_stats(self) -> None:
+        """Print time spent per stage, and memory per list."""
+        stages = recorder.dump()
+        if stages:
+            print(Color.fmt(f"{'stage':<8}{'calls':>8}{'total ms':>12}"
+                            f"{'mean ms':>10}{'scanned':>12}{'matched':>10}",
+                            Color.BOLD))
+
+        for stage, stats in stages.items():
+            total = stats['seconds'] * 1000
+            print(f"{stage:<8}{stats['calls']:>8}{total:>12.1f}"
+                  f"{total / max(stats['calls'], 1):>10.1f}"
+                  f"{stats['scanned']:>12}{stats['matched']:>10}")
+
+        if stages:
+            print()
+
+        print(Color.fmt(f"{'list':<40}{'words':>10}{'KiB':>10}", Color.BOLD))
+        for name, (words, size) in self.memory_usage().items():
+            print(f"{name:<40}{words:>10}{size // 1024:>10}")
+
+    # Name memory_usage reports the shared word table under
+    WORD_TABLE = '(shared word table)'
+
+    def memory_usage(self) -> dict[str, tuple[int, int]]:
+        """Return { list name: (words, approximate bytes) }. Words are
+        counted once, under WORD_TABLE, rather than in every list."""
+        usage = {}
+        for name in self.filelist:
+            words = self.data[name]
+            if isinstance(words, ScoreList):
+                size = words.memory_usage()
+            else:
+                size = sys.getsizeof(words) + sum(map(sys.getsizeof, words))
+
+            usage[name] = (len(words), size)
+
+        usage[self.WORD_TABLE] = (len(self.table), self.table.memory_usage())
+        return usage
+
+    def time_budget(self, seconds: float | None
+                    ) -> contextlib.AbstractContextManager[None]:
+        """Limit queries run inside the block to seconds (None for no
+        limit). Past it, searches raise BudgetExceeded; streamed results
+        read so far are still good, e.g.
+
+            with wl.time_budget(2):
+                matches, complete = wl.collect(wl.iter_search_regex(r))
+        """
+        return self.budget.limit(seconds)
+
+    @staticmethod
+    def collect(results: Iterable[T]) -> tuple[list[T], bool]:
+        """Read a stream of results until it ends, Ctrl-C is pressed, or
+        the time budget runs out. Returns (results so far, whether that's
+        all of them)."""
+        collected: list[T] = []
+        try:
+            for result in results:
+                collected.append(result)
+        except (KeyboardInterrupt, BudgetExceeded):
+            return collected, False
+
+        return collected, True
+
     def contains(self, word: str, score_minimum: int = 0) -> bool:
         """Return whether a word exists."""
         contains, _ = self.score(word, score_minimum)
@@ -161,13 +597,12 @@ class Wordlist():
         max_score = 0
         contains = False
 
-        for file in self.filelist:
-            filelist = self.data[file]
-            if word in filelist and filelist[word] >= score_minimum:
-                if filelist[word] == 0:
+        for file_score in self.file_scores.get(word, ()):
+            if file_score is not None and file_score >= score_minimum:
+                if file_score == 0:
                     return False, 0
 
-                max_score = filelist[word]
+                max_score = file_score
                 contains = True
 
         return contains, max_score
@@ -222,9 +657,7 @@ class Wordlist():
 
         # Too many words, just report number of matches.
         if max_result_count and len(matches) > max_result_count:
-            print(f"\n& omitting {len(matches)} other words with "
-                  f"{Color.green(original_word)} as substring "
-                  f"({score_minimum}+)")
+            self.print_omitted(len(matches), original_word, score_minimum)
             return
 
         # Prints table of matching words
@@ -245,22 +678,51 @@ class Wordlist():
                   f"{Color.highlight(match, original_word, Color.YELLOW)} "
                   f"({len(match)})")
 
+    def print_incomplete(self) -> None:
+        print(Color.fmt('(stopped early, results are incomplete)',
+                        Color.BOLD, Color.RED))
+
+    def print_omitted(self, count: int, original_word: str,
+                      score_minimum: int = 40) -> None:
+        print(f"\n& omitting {count} other words with "
+              f"{Color.green(original_word)} as substring "
+              f"({score_minimum}+)")
+
     # FILE MANAGEMENT #
     ###################
     @staticmethod
     def parse_wordlist_file(path: Path) -> tuple[str, dict[str, int]]:
+        name, words, scores, errors = Wordlist.read_wordlist_file(path)
+
+        for error in errors:
+            print(error, file=sys.stderr)
+
+        return name, dict(zip(words, scores))
+
+    @staticmethod
+    def read_wordlist_file(path: Path
+                           ) -> tuple[str, list[str], array, list[str]]:
+        """Parse a wordlist, using its compiled cache when it's fresh.
+
+        Returns the list's name, its words, their scores, and invalid line
+        diagnostics."""
         name = path.parts[-1]
 
+        cached = wordcache.read_cache(path)
+        if cached is not None:
+            return name, *cached
+
         words = {}
+        errors = []
 
         with open(path) as f:
             for line in f:
                 line = line.strip()
                 split = line.split(';')
 
-                # If there's a malformed line, print error and ignore.
+                # If there's a malformed line, report error and ignore.
                 if len(split) < 2:
-                    print(f"{path}: invalid line: {line}", file=sys.stderr)
+                    errors.append(f"{path}: invalid line: {line}")
                     continue
 
                 word = split[0]
@@ -270,29 +732,209 @@ class Wordlist():
                 normalized_word = util.normalize(word)
                 words[normalized_word] = int(score)
 
-        return name, words
+        word_column = list(words)
+        scores = array('h', words.values())
+        wordcache.write_cache(path, word_column, scores, errors)
+
+        return name, word_column, scores, errors
 
     # This can follow a directory one level down and parse its files. It loads
     # one path, which can be a directory or a single file. But it doesn't
     # recurse more than once.
-    def load_single_path(self, path: str) -> None:
+    def load_single_path(self, path: str, jobs: int = 1) -> None:
+        self.load_paths(Wordlist.wordlist_paths(path), jobs)
+
+    @staticmethod
+    def wordlist_paths(path: str) -> list[Path]:
+        """Return the wordlist files for one path, which can be a directory
+        or a single file."""
         file = Path(path)
 
         if file.is_file():
-            name, file_list = Wordlist.parse_wordlist_file(file)
-            self.filelist.append(name)
-            self.data[name] = file_list
+            return [file]
 
         elif file.is_dir():
-            for child in file.iterdir():
-                name, file_list = Wordlist.parse_wordlist_file(child)
-                self.filelist.append(name)
-                self.data[name] = file_list
+            # Sorted, so loading (and its diagnostics) is deterministic. Skip
+            # hidden files, e.g. compiled caches.
+            return sorted(child for child in file.iterdir()
+                          if not child.name.startswith('.'))
 
         else:
             print(f"file not found: {path}")
             exit(1)
 
+    def load_paths(self, paths: list[Path], jobs: int = 1) -> None:
+        """Parse wordlist files, in a process pool if jobs > 1.
+
+        Results (and invalid line diagnostics) are handled in the order of
+        paths, regardless of which worker finishes first."""
+        results: Iterable[tuple[str, list[str], array, list[str]]]
+        with recorder.timed('load'):
+            if jobs > 1 and len(paths) > 1:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    results = list(pool.map(Wordlist.read_wordlist_file,
+                                            paths))
+            else:
+                results = list(map(Wordlist.read_wordlist_file, paths))
+
+        for path, (name, words, scores, errors) in zip(paths, results):
+            for error in errors:
+                print(error, file=sys.stderr)
+
+            self.filelist.append(name)
+            self.data[name] = ScoreList.from_columns(self.table, words,
+                                                     scores)
+            self.sources[name] = (path, *Wordlist._stat(path))
+
+    def _sort_filelist(self) -> None:
+        # Lists are searched in name order, except the score journal, which
+        # always comes last.
+        journal = self.journal.name if self.journal is not None else None
+        self.filelist.sort(key=lambda name: (name == journal, name))
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return -1, -1
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def _build_index(self) -> None:
+        """Merge the loaded lists into self.file_scores and self.scores.
+
+        Must be called whenever self.filelist changes."""
+        files = [self.data[file] for file in self.filelist]
+
+        with recorder.timed('index'):
+            self._build_file_scores(files)
+
+            # Later lists override earlier ones, so updating in precedence
+            # order leaves the effective score.
+            scores: dict[str, int] = {}
+            ignored: set[str] = set()
+            for words in files:
+                scores.update(words.items())
+                if isinstance(words, ScoreList):
+                    ignored.update(words.words_scored(0))
+                else:
+                    ignored.update(k for k, v in words.items() if v == 0)
+
+            for word in ignored:
+                del scores[word]
+
+        self.scores = scores
+        self._tombstones = set()
+        self._positional = None
+        self._trigram = None
+        self._suffix_array = None
+        self._affix = None
+        self._anagram = None
+        self._neighbors = None
+        self._drop_snapshot()
+        self.cache.clear()
+
+    def _build_file_scores(self, files: list[Mapping[str, int]]) -> None:
+        self.file_scores = FileScores(self.table, files)
+
+    def _patch_index(self, name: str, old: Mapping[str, int],
+                     new: Mapping[str, int]) -> None:
+        """Update the merged index after list name changed from old to new,
+        touching only the words in either version."""
+        if name not in self.filelist:
+            return
+
+        # self.data already holds the new version
+        self._build_file_scores([self.data[file] for file in self.filelist])
+        entered = []
+
+        for word in old.keys() | new.keys():
+            present = [v for v in self.file_scores.get(word, ())
+                       if v is not None]
+
+            was_indexed = word in self.scores or word in self._tombstones
+            if not present or 0 in present:
+                if self.scores.pop(word, None) is not None:
+                    self._tombstones.add(word)
+            else:
+                self.scores[word] = present[-1]
+                self._tombstones.discard(word)
+                if not was_indexed:
+                    entered.append(word)
+
+        self._add_to_indexes(entered)
+        self._drop_snapshot()
+        self.cache.clear()
+
+    def _add_to_indexes(self, words: list[str]) -> None:
+        if not words:
+            return
+
+        for index in (self._positional, self._trigram, self._suffix_array,
+                      self._affix, self._anagram, self._neighbors):
+            if index is not None:
+                index.add(words)
+
+    def _drop_snapshot(self) -> None:
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def _index_words(self) -> list[str]:
+        """Words the derived indexes cover: every scored word, plus
+        tombstones."""
+        return [*self.scores, *self._tombstones]
+
+    def positional_index(self) -> PositionalIndex:
+        if self._positional is None:
+            with recorder.timed('index'):
+                self._positional = PositionalIndex(self._index_words())
+
+        return self._positional
+
+    def trigram_index(self) -> TrigramIndex:
+        if self._trigram is None:
+            with recorder.timed('index'):
+                self._trigram = TrigramIndex(self._index_words())
+
+        return self._trigram
+
+    def suffix_array(self) -> SuffixArray:
+        if self._suffix_array is None:
+            with recorder.timed('index'):
+                self._suffix_array = SuffixArray(self._index_words())
+
+        return self._suffix_array
+
+    def affix_index(self) -> AffixIndex:
+        if self._affix is None:
+            with recorder.timed('index'):
+                self._affix = AffixIndex(self._index_words())
+
+        return self._affix
+
+    def anagram_index(self) -> AnagramIndex:
+        if self._anagram is None:
+            with recorder.timed('index'):
+                self._anagram = AnagramIndex(self._index_words())
+
+        return self._anagram
+
+    def neighbor_index(self) -> NeighborIndex:
+        if self._neighbors is None:
+            with recorder.timed('index'):
+                self._neighbors = NeighborIndex(self._index_words())
+
+        return self._neighbors
+
+    def scan_snapshot(self) -> ScanSnapshot:
+        if self._snapshot is None:
+            with recorder.timed('index'):
+                self._snapshot = ScanSnapshot(self.scores)
+
+        return self._snapshot
+
     # SEARCHING #
     #############
     def match_exact(self, word: str) -> list[tuple[int, str]]:
@@ -300,10 +942,9 @@ class Wordlist():
         # [ (score, filename) ]
         results: list[tuple[int, str]] = []
 
-        for file in self.filelist:
-            filelist = self.data[file]
-            if word in filelist:
-                score = filelist[word]
+        file_scores = self.file_scores.get(word, ())
+        for score, file in zip(file_scores, self.filelist):
+            if score is not None:
                 results.append((score, file))
 
         return results
@@ -311,47 +952,527 @@ class Wordlist():
     def search_regex(self,
                      regex: str,
                      score_minimum: int = 40,
-                     score_maximum: int | None = None
+                     score_maximum: int | None = None,
+                     len_min: int | None = None,
+                     len_max: int | None = None
                      ) -> dict[str, int]:
-        matches = self.search(util.regex_match_bool(regex),
-                              score_minimum, score_maximum)
+        return dict(self.iter_search_regex(regex, score_minimum, score_maximum,
+                                           len_min, len_max))
+
+    def iter_search_regex(self,
+                          regex: str,
+                          score_minimum: int = 40,
+                          score_maximum: int | None = None,
+                          len_min: int | None = None,
+                          len_max: int | None = None
+                          ) -> Iterator[tuple[str, int]]:
+        filters = QueryCache.filters(score_minimum, score_maximum,
+                                     len_min, len_max)
+        yield from self._iter_cached(
+            ('regex', regex), filters,
+            lambda: self._iter_search_regex(regex, *filters))
+
+    def _iter_search_regex(self,
+                           regex: str,
+                           score_minimum: int = 40,
+                           score_maximum: int | None = None,
+                           len_min: int | None = None,
+                           len_max: int | None = None
+                           ) -> Iterator[tuple[str, int]]:
+        # Plain fill patterns (letters and dots) are answered by the positional
+        # index; everything else goes through the regex engine.
+        if PositionalIndex.is_fill_pattern(regex):
+            words = self.positional_index().match(regex, len_min, len_max)
+            self.last_scan = (len(words), len(self.scores))
+            yield from self.iter_scores(words, score_minimum, score_maximum)
+            return
+
+        # Otherwise, narrow down to words containing the regex's required
+        # literals, if it has any.
+        candidates = self.trigram_index().candidates(regex)
+        match_fn = util.regex_match_bool(regex)
+
+        # Failing that, big scans are split across processes.
+        if candidates is None and self.scan_jobs > 1 and \
+                len(self.scores) >= self.PARALLEL_SCAN_MINIMUM:
+            yield from self._iter_sharded_regex(regex, score_minimum,
+                                                score_maximum, len_min,
+                                                len_max)
+            return
 
-        return matches
+        yield from self.iter_search(match_fn, score_minimum, score_maximum,
+                                    len_min, len_max, candidates)
+
+    # Fewer words than this aren't worth handing to worker processes.
+    PARALLEL_SCAN_MINIMUM = 100_000
+
+    def _iter_sharded_regex(self,
+                            regex: str,
+                            score_minimum: int = 40,
+                            score_maximum: int | None = None,
+                            len_min: int | None = None,
+                            len_max: int | None = None
+                            ) -> Iterator[tuple[str, int]]:
+        """Same results (and order) as iter_search over every word, from
+        shards scanned in self.scan_jobs processes."""
+        snapshot = self.scan_snapshot()
+        self.last_scan = (len(self.scores), len(self.scores))
+
+        filters = (score_minimum, score_maximum, len_min, len_max)
+        for i in snapshot.scan(regex, filters, self.scan_jobs,
+                               self.budget.check):
+            word = snapshot.words[i]
+            yield word, self.scores[word]
 
     def search_substring(self,
                          word: str,
                          score_minimum: int = 40,
                          score_maximum: int | None = None
                          ) -> dict[str, int]:
-        matches = self.search(lambda x: word in x, score_minimum)
+        return dict(self.iter_search_substring(word, score_minimum,
+                                               score_maximum))
+
+    def iter_search_substring(self,
+                              word: str,
+                              score_minimum: int = 40,
+                              score_maximum: int | None = None,
+                              len_min: int | None = None,
+                              len_max: int | None = None
+                              ) -> Iterator[tuple[str, int]]:
+        filters = QueryCache.filters(score_minimum, score_maximum,
+                                     len_min, len_max)
+        yield from self._iter_cached(
+            ('substring', word), filters,
+            lambda: self._iter_search_substring(word, *filters))
+
+    def count_substring(self,
+                        word: str,
+                        score_minimum: int = 40,
+                        score_maximum: int | None = None,
+                        len_min: int | None = None,
+                        len_max: int | None = None
+                        ) -> int:
+        """Count the results search_substring would return, without building
+        them."""
+        filters = QueryCache.filters(score_minimum, score_maximum,
+                                     len_min, len_max)
+        cached = self.cache.get(('substring', word), filters)
+        if cached is not None:
+            self.last_scan = (0, len(self.scores))
+            return self.count_results(self._apply_filters(cached, filters))
+
+        passes = filter_fn(filters)
+        suffix_array = self.suffix_array()
+        words = suffix_array.words
+        scores = self.scores
+
+        count = 0
+        scanned = 0
+        for scanned, i in enumerate(suffix_array.iter_ids(word), 1):
+            if scanned % self.CHECK_EVERY == 0:
+                self.budget.check()
+
+            k = words[i]
+            v = scores.get(k)
+            if v is not None and k != word and passes(k, v):
+                count += 1
+
+        self.last_scan = (scanned, len(self.scores))
+        return count
+
+    def _iter_search_substring(self,
+                               word: str,
+                               score_minimum: int = 40,
+                               score_maximum: int | None = None,
+                               len_min: int | None = None,
+                               len_max: int | None = None
+                               ) -> Iterator[tuple[str, int]]:
+        suffix_array = self.suffix_array()
+        ids = sorted(suffix_array.ids(word))
+        self.last_scan = (len(ids), len(self.scores))
+
+        words = (suffix_array.words[i] for i in ids)
+        for k, v in self.iter_scores(words, score_minimum, score_maximum,
+                                     len_min, len_max):
+            # Skip original word so we don't print it later
+            if k != word:
+                yield k, v
+
+    def _iter_cached(self, key: tuple[str, str], filters: Filters,
+                     search: Callable[[], Iterator[tuple[str, int]]]
+                     ) -> Iterator[tuple[str, int]]:
+        """Serve a search from the cache if possible. Otherwise run it, and
+        cache the results if the caller reads all of them."""
+        cached = self.cache.get(key, filters)
+        if cached is not None:
+            self.last_scan = (0, len(self.scores))
+            yield from self._apply_filters(cached, filters)
+            return
+
+        # Results too big to cache aren't kept, so a count or a first page
+        # of a huge result doesn't hold all of it in memory.
+        results: list[tuple[str, int]] | None = []
+        for match in search():
+            if results is not None:
+                results.append(match)
+                if len(results) > self.cache.max_words:
+                    results = None
+
+            yield match
+
+        if results is not None:
+            self.cache.put(key, filters, results, len(results))
+
+    @staticmethod
+    def _apply_filters(matches: Iterable[tuple[str, int]], filters: Filters
+                       ) -> Iterator[tuple[str, int]]:
+        passes = filter_fn(filters)
+        return ((k, v) for k, v in matches if passes(k, v))
 
-        # Remove original word so we don't print it later
-        if word in matches:
-            del matches[word]
+    @staticmethod
+    def count_results(results: Iterable[tuple[str, int]],
+                      limit: int | None = None) -> int:
+        """Count the results of an iter_search* generator, without building
+        them. If limit is given, stop counting once it's exceeded."""
+        count = 0
+        for _ in results:
+            count += 1
+            if limit is not None and count > limit:
+                break
+
+        return count
+
+    def search_sandwich(self,
+                        word: str,
+                        score_minimum: int = 40,
+                        score_maximum: int | None = None
+                        ) -> list[tuple[str, str, dict[str, int]]]:
+        """Find words that surround word, i.e. start with a prefix of it and
+        end with the rest, with something in between.
+
+        Returns (prefix, suffix, matches) for each split that has matches.
+        A word is only reported for the first split it matches, and words
+        containing word itself are left out."""
+        return list(self.iter_search_sandwich(word, score_minimum,
+                                              score_maximum))
+
+    def iter_search_sandwich(self,
+                             word: str,
+                             score_minimum: int = 40,
+                             score_maximum: int | None = None
+                             ) -> Iterator[tuple[str, str, dict[str, int]]]:
+        """Like search_sandwich, but yields each split as it's found."""
+        # A word passes the score filter for every split or none, so tighter
+        # filters can be applied group by group to a cached result.
+        key = ('sandwich', word)
+        filters = QueryCache.filters(score_minimum, score_maximum)
+        cached = self.cache.get(key, filters)
+        if cached is not None:
+            for prefix, suffix, matches in cached:
+                matches = dict(self._apply_filters(matches.items(), filters))
+                if matches:
+                    yield prefix, suffix, matches
+            return
+
+        affix_index = self.affix_index()
+        results = []
+
+        # track seen words so we don't report them repeatedly
+        seen: set[str] = set()
+
+        for i in range(1, len(word)):
+            self.budget.check()
+            prefix, suffix = word[:i], word[i:]
+
+            matches = self.filter_scores(affix_index.sandwiched(prefix, suffix),
+                                         score_minimum, score_maximum)
+
+            # remove result if it contains the original word
+            filtered = {k: v for k, v in matches.items()
+                        if word not in k and k not in seen}
+
+            seen.update(matches)
+
+            if filtered:
+                results.append((prefix, suffix, filtered))
+                yield prefix, suffix, filtered
+
+        # Only complete results are cached
+        self.cache.put(key, filters, results,
+                       sum(len(matches) for _, _, matches in results))
+
+    def search_anagram(self,
+                       letters: str,
+                       score_minimum: int = 40,
+                       score_maximum: int | None = None
+                       ) -> list[tuple[str, dict[str, int]]]:
+        """Find anagrams of letters, plus one letter and minus one letter.
+
+        Returns (label, matches) groups: '=' for exact anagrams, then '+x'
+        and '-x' for each letter added or dropped that has matches."""
+        anagram_index = self.anagram_index()
+
+        groups = [('=', anagram_index.anagrams(letters))]
+        groups += [(f'+{c}', words)
+                   for c, words in anagram_index.plus_one(letters).items()]
+        groups += [(f'-{c}', words)
+                   for c, words in anagram_index.minus_one(letters).items()]
+
+        results = []
+        for label, words in groups:
+            matches = self.filter_scores(words, score_minimum, score_maximum)
+            # The letters themselves aren't an interesting anagram
+            matches.pop(letters, None)
+            if matches:
+                results.append((label, matches))
+
+        return results
+
+    def search_letter_bank(self,
+                           bank: str,
+                           score_minimum: int = 40,
+                           score_maximum: int | None = None,
+                           min_length: int = 3
+                           ) -> dict[str, int]:
+        """Find words spelled from a bank of letters, using each letter at
+        most as often as it's in the bank."""
+        words = self.anagram_index().sub_anagrams(bank, min_length)
+        return self.filter_scores(words, score_minimum, score_maximum)
+
+    def search_neighbors(self,
+                         word: str,
+                         distance: int = 1,
+                         score_minimum: int = 40,
+                         score_maximum: int | None = None
+                         ) -> list[tuple[str, int, int]]:
+        """Find words within an edit distance of word (not counting word
+        itself). Returns (word, distance, score), closest first."""
+        passes = filter_fn((score_minimum, score_maximum, None, None))
+        results = []
+        for match, match_distance in self.neighbor_index().within(word,
+                                                                  distance):
+            if match == word:
+                continue
+
+            v = self.scores.get(match)
+            if v is not None and passes(match, v):
+                results.append((match, match_distance, v))
+
+        return results
+
+    def search_fill(self,
+                    grid: Grid | str,
+                    score_minimum: int = 50,
+                    max_fills: int = 10,
+                    seconds: float | None = None
+                    ) -> list[Fill]:
+        """Fill a crossword grid (a Grid, or rows as Grid.parse takes them)
+        with words scoring at least score_minimum. Returns up to max_fills
+        fills, best first, from those found within seconds."""
+        with self.time_budget(seconds):
+            fills, _ = self.collect(itertools.islice(
+                self.iter_search_fill(grid, score_minimum), max_fills))
+
+        fills.sort(key=Fill.rank)
+        return fills
+
+    def iter_search_fill(self,
+                         grid: Grid | str,
+                         score_minimum: int = 50
+                         ) -> Iterator[Fill]:
+        """Yield fills of a grid as they're found. Each slot's candidates
+        come from the positional index; letters given in the grid are kept
+        even if they don't spell a listed word."""
+        if isinstance(grid, str):
+            grid = Grid.parse(grid)
+
+        candidates = []
+        for pattern in grid.patterns():
+            if '.' not in pattern:
+                candidates.append({pattern: self.scores.get(pattern, 0)})
+                continue
+
+            regex = ''.join([c if c == '.' else re.escape(c)
+                             for c in pattern])
+            candidates.append(self.search_regex(regex, score_minimum,
+                                                len_min=len(pattern),
+                                                len_max=len(pattern)))
+
+        filler = GridFiller(grid, candidates, self.budget.check)
+        yield from filler.fills()
+
+    def search_near_halves(self,
+                           distance: int = 1,
+                           score_minimum: int = 50,
+                           len_min: int | None = 9
+                           ) -> dict[str, int]:
+        """Find words whose two halves are near misses of each other, like
+        dillydally or willynilly."""
+        def match_fn(word: str) -> bool:
+            mid = len(word) // 2
+            return 0 < Levenshtein.distance(word[:mid], word[mid:],
+                                            score_cutoff=distance) <= distance
+
+        return self.search(match_fn, score_minimum, len_min=len_min)
+
+    # These endings are conjugations/declensions, not other words, so compound
+    # searches omit them by default.
+    COMMON_ENDINGS = ('ing', 'ings', 'son', 'ness', 'edon', 'ingon', 'sof',
+                      'ish', 'est', 'ingup', 'iest', 'edup', 'ies', 'sup',
+                      'ier')
+
+    def search_compound(self,
+                        w1: str,
+                        w2: str,
+                        score_minimum: int = 50,
+                        result_minimum: int = 40,
+                        exclude: Iterable[str] = COMMON_ENDINGS,
+                        min_suffix_length: int = 3
+                        ) -> list[tuple[str, str, str, int]]:
+        """Join the suffixes of words starting with w1 to the suffixes of
+        words starting with w2, and return the joins that are words.
+
+        Source words need score_minimum, joined words need result_minimum.
+        Returns (w1 suffix, w2 suffix, word, score), best scores first."""
+        affix_index = self.affix_index()
+        excluded = set(exclude)
+
+        def suffixes(prefix: str) -> set[str]:
+            words = self.filter_scores(affix_index.prefixed(prefix),
+                                       score_minimum)
+            return {w[len(prefix):] for w in words
+                    if len(w) - len(prefix) >= min_suffix_length} - excluded
+
+        w1_suffixes = suffixes(w1)
+        w2_suffixes = suffixes(w2)
+        if not w2_suffixes:
+            return []
+
+        results = []
+        for w1_suffix in w1_suffixes:
+            # Probe from whichever side is smaller: the words starting with
+            # w1_suffix (none means no join can work), or every w2 suffix.
+            count = affix_index.count_prefixed(w1_suffix)
+            if count == 0:
+                continue
+
+            if count < len(w2_suffixes):
+                joins = [(w[len(w1_suffix):], w)
+                         for w in affix_index.prefixed(w1_suffix)]
+                joins = [(s, w) for s, w in joins if s in w2_suffixes]
+            else:
+                joins = [(s, w1_suffix + s) for s in w2_suffixes]
+
+            for w2_suffix, word in joins:
+                score = self.scores.get(word)
+                if score is not None and score >= result_minimum:
+                    results.append((w1_suffix, w2_suffix, word, score))
+
+        results.sort(key=lambda t: (-t[3], len(t[2]), t[2]))
+        return results
+
+    def search_transform(self,
+                         transform: Transform,
+                         score_minimum: int = 40,
+                         target_minimum: int = 0,
+                         len_min: int | None = None,
+                         len_max: int | None = None
+                         ) -> list[tuple[str, str, int, int]]:
+        """Apply a transform to every word, and keep the words whose
+        transformed version is also a word.
+
+        Source words need score_minimum, transformed words need
+        target_minimum. Returns (word, transformed, score, transformed
+        score)."""
+        # Only visit words the transform can apply to, if it says which.
+        words: Iterable[str]
+        if transform.substring:
+            words = self.suffix_array().find(transform.substring)
+        elif transform.prefix:
+            words = self.affix_index().prefixed(transform.prefix)
+        else:
+            words = self.scores
+
+        sources = dict(self.iter_scores(words, score_minimum, None,
+                                        len_min, len_max))
+        self.last_scan = (len(sources), len(self.scores))
 
-        return matches
+        results = []
+        for n, (word, new_word) in enumerate(transform.apply_all(sources)):
+            if n % self.CHECK_EVERY == 0:
+                self.budget.check()
+
+            new_score = self.scores.get(new_word)
+            if new_score is not None and new_score >= target_minimum:
+                results.append((word, new_word, sources[word], new_score))
+
+        return results
+
+    # How many words scan loops go between time budget checks
+    CHECK_EVERY = 1024
 
     def search(self,
                match_fn: Callable[[str], bool],
                score_minimum: int = 40,
-               score_maximum: int | None = None
+               score_maximum: int | None = None,
+               len_min: int | None = None,
+               len_max: int | None = None,
+               candidates: list[str] | None = None
                ) -> dict[str, int]:
-        """Searches all wordlists, using a provided match_fn lambda."""
-        matches = {}
-
-        # Checks against each file, instead of a compiled list.
-        # Thus, if the score meets the criteria in ANY list, it will be
-        # reported, even if it's later overriden.
-        for file in self.filelist:
-            filelist = self.data[file]
-            for k, v in filelist.items():
-                if match_fn(k):
-                    if v < score_minimum:
-                        continue
-
-                    if score_maximum and v > score_maximum:
-                        continue
+        """Searches all wordlists, using a provided match_fn lambda.
 
-                    matches[k] = v
+        If candidates is given, only those words are checked; otherwise every
+        word is."""
+        return dict(self.iter_search(match_fn, score_minimum, score_maximum,
+                                     len_min, len_max, candidates))
 
-        return matches
+    def iter_search(self,
+                    match_fn: Callable[[str], bool],
+                    score_minimum: int = 40,
+                    score_maximum: int | None = None,
+                    len_min: int | None = None,
+                    len_max: int | None = None,
+                    candidates: list[str] | None = None
+                    ) -> Iterator[tuple[str, int]]:
+        """Like search, but yields (word, score) as they're found, so callers
+        can stop early."""
+        items: Iterable[tuple[str, int]]
+        if candidates is None:
+            items = self.scores.items()
+            self.last_scan = (len(self.scores), len(self.scores))
+        else:
+            items = ((k, self.scores[k]) for k in candidates
+                     if k in self.scores)
+            self.last_scan = (len(candidates), len(self.scores))
+
+        # Checks against the merged index, so each word is tested once and
+        # filtered on its effective score.
+        passes = filter_fn((score_minimum, score_maximum, len_min, len_max))
+        for n, (k, v) in enumerate(items):
+            if n % self.CHECK_EVERY == 0:
+                self.budget.check()
+
+            if passes(k, v) and match_fn(k):
+                yield k, v
+
+    def filter_scores(self, words: Iterable[str],
+                      score_minimum: int = 40,
+                      score_maximum: int | None = None
+                      ) -> dict[str, int]:
+        """Look up candidate words from an index and apply score filters."""
+        return dict(self.iter_scores(words, score_minimum, score_maximum))
+
+    def iter_scores(self, words: Iterable[str],
+                    score_minimum: int = 40,
+                    score_maximum: int | None = None,
+                    len_min: int | None = None,
+                    len_max: int | None = None
+                    ) -> Iterator[tuple[str, int]]:
+        passes = filter_fn((score_minimum, score_maximum, len_min, len_max))
+        for n, word in enumerate(words):
+            if n % self.CHECK_EVERY == 0:
+                self.budget.check()
+
+            v = self.scores.get(word)
+            if v is not None and passes(word, v):
+                yield word, v
@@ -0,0 +1,192 @@
+import itertools
+import sys
+
+from array import array
+from collections.abc import ItemsView
+from collections.abc import Mapping
+from typing import Iterable
+from typing import Iterator
+
+
+class WordTable():
+    """Every distinct word across the loaded lists, stored once.
+
+    The big lists overlap heavily, so rather than each list keeping its own
+    copy of each word, lists refer to words by id. The merged index and the
+    derived indexes key on the same string objects.
+    """
+
+    def __init__(self) -> None:
+        # self.words maps id -> word, self.ids maps word -> id
+        self.words: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def intern(self, word: str) -> int:
+        i = self.ids.get(word)
+        if i is None:
+            i = len(self.words)
+            self.ids[word] = i
+            self.words.append(word)
+
+        return i
+
+    def intern_all(self, words: list[str]) -> list[int]:
+        """intern() every word of a list of distinct words, in bulk."""
+        ids = self.ids
+        if ids:
+            found = list(map(ids.get, words, itertools.repeat(-1)))
+            new = [word for word, i in zip(words, found) if i < 0]
+            if not new:
+                return found
+        else:
+            new = words
+
+        start = len(self.words)
+        ids.update(zip(new, range(start, start + len(new))))
+        self.words.extend(new)
+
+        if len(new) == len(words):
+            return list(range(start, start + len(new)))
+
+        return list(map(ids.__getitem__, words))
+
+    def memory_usage(self) -> int:
+        """Approximate bytes used by the table and its strings."""
+        return (sys.getsizeof(self.words) + sys.getsizeof(self.ids) +
+                sum(map(sys.getsizeof, self.words)))
+
+
+class ScoreList(Mapping[str, int]):
+    """One wordlist as a score array indexed by word id.
+
+    Reads like the { word: score } dict it replaces. Since the lists mostly
+    share words, a 2 byte slot per table word is smaller than a dict entry
+    (or an id and score) per list word, and finding a word's score in every
+    list is one table lookup plus an array index per list. The ids of the
+    list's own words are kept too, so walking a small list doesn't mean
+    walking every word of the table.
+    """
+
+    # Marks words of the table that aren't in this list
+    ABSENT = -(1 << 15)
+
+    def __init__(self, table: WordTable, words: Mapping[str, int]) -> None:
+        self._fill(table, list(words), words.values())
+
+    @classmethod
+    def from_columns(cls, table: WordTable, words: list[str],
+                     scores: array) -> 'ScoreList':
+        """Build from words and their scores in two columns, e.g. as read
+        from a wordlist cache, without a dict in between."""
+        score_list = cls.__new__(cls)
+        score_list._fill(table, words, scores)
+        return score_list
+
+    def _fill(self, table: WordTable, words: list[str],
+              scores: Iterable[int]) -> None:
+        self.table = table
+
+        start = len(table)
+        ids = table.intern_all(words)
+        self.scores = array('h', [self.ABSENT]) * len(table)
+
+        # If every word was new, their ids run in order from start.
+        if len(table) - start == len(ids):
+            self.scores[start:] = array('h', scores)
+        else:
+            for i, score in zip(ids, scores):
+                self.scores[i] = score
+
+        self.ids = array('I', ids)
+
+    def score_of(self, i: int) -> int | None:
+        """Score of the word with id i, or None if it isn't in the list."""
+        if i < len(self.scores):
+            score = self.scores[i]
+            if score != self.ABSENT:
+                return score
+
+        return None
+
+    def __getitem__(self, word: str) -> int:
+        i = self.table.ids.get(word)
+        score = self.score_of(i) if i is not None else None
+        if score is None:
+            raise KeyError(word)
+
+        return score
+
+    def __iter__(self) -> Iterator[str]:
+        return (word for word, _ in self.items())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def items(self) -> 'ScoreListItems':
+        return ScoreListItems(self)
+
+    def words_scored(self, score: int) -> Iterator[str]:
+        """Words with the given score, e.g. 0 for the ignored ones."""
+        return itertools.compress(self.table.words,
+                                  map(score.__eq__, self.scores))
+
+    def memory_usage(self) -> int:
+        """Bytes used by this list, not counting the shared word table."""
+        return (sys.getsizeof(self) + sys.getsizeof(self.scores) +
+                sys.getsizeof(self.ids))
+
+
+class ScoreListItems(ItemsView[str, int]):
+    # Walk the arrays instead of looking up every word
+    _mapping: ScoreList
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        ids = self._mapping.ids
+        return zip(map(self._mapping.table.words.__getitem__, ids),
+                   map(self._mapping.scores.__getitem__, ids))
+
+
+class FileScores(Mapping[str, tuple[int | None, ...]]):
+    """{ word: per-file scores } over a list of wordlists, with None where a
+    list doesn't contain the word.
+
+    Computed on lookup rather than stored, since the lists already hold
+    every score.
+    """
+
+    def __init__(self, table: WordTable, files: list[Mapping[str, int]]
+                 ) -> None:
+        self.table = table
+        self.files = files
+
+        # (score array, None) for ScoreLists, (None, list) for anything else
+        self.columns = [(words.scores, None) if isinstance(words, ScoreList)
+                        else (None, words) for words in files]
+
+    def __getitem__(self, word: str) -> tuple[int | None, ...]:
+        i = self.table.ids.get(word, -1)
+        absent = ScoreList.ABSENT
+
+        scores: list[int | None] = []
+        for array_scores, words in self.columns:
+            if array_scores is not None:
+                score = array_scores[i] if -1 < i < len(array_scores) \
+                    else absent
+                scores.append(None if score == absent else score)
+            else:
+                assert words is not None
+                scores.append(words.get(word))
+
+        if scores.count(None) == len(scores):
+            raise KeyError(word)
+
+        return tuple(scores)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(itertools.chain.from_iterable(self.files)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)